@@ -0,0 +1,5 @@
+"""Shared tooling for running and measuring the daily solutions.
+
+The solutions themselves live in the `dN` directories; this package only
+knows how to drive them.
+"""
@@ -0,0 +1,18 @@
+"""Command line entry point, `python -m advent2021 <command>`."""
+
+import argparse
+import sys
+
+from advent2021 import run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m advent2021")
+    commands = parser.add_subparsers(required=True, metavar="command")
+    run.configure(commands.add_parser("run", help="run and time solutions"))
+    args = parser.parse_args(argv)
+    return args.main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""Benchmark every solution stage by stage on scaled inputs.
+
+Usage (from the repository root):
+
+    $ python -m advent2021.bench --scales 1 10 --save bench.json
+    $ python -m advent2021.bench --scales 1 10 --compare bench.json
+
+A scale of 1 runs on the puzzle input, larger scales run on inputs generated
+by `advent2021.generate` of that size. Each case runs in a fresh process, and
+the memory reported for a stage is how much it raised the peak RSS of that
+process above the stages before it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Final, Iterable, Iterator
+
+from advent2021 import generate
+from advent2021.solutions import ROOT, SOLUTIONS, Key, Solution
+
+STAGES: Final[tuple[str, ...]] = ("read", "parse", "solve")
+
+
+def count_records(path: Path) -> int:
+    """Number of records in the input, used to derive ops/sec.
+
+    Records are lines, or values for inputs that are one line of values.
+    """
+    lines, values, last = 0, 0, ""
+    with path.open() as f:
+        while chunk := f.read(1 << 20):
+            lines += chunk.count("\n")
+            values += chunk.count(",")
+            last = chunk[-1]
+
+    lines += last not in ("", "\n")
+    return values + 1 if lines == 1 else lines
+
+
+@dataclass
+class StageResult:
+    seconds: float
+    rss_increase_kb: int
+    ops_per_sec: float
+
+
+@dataclass
+class CaseResult:
+    day: int
+    part: str
+    scale: int
+    records: int = 0
+    status: str = "ok"
+    stages: dict[str, StageResult] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"d{self.day}.part{self.part}@{self.scale}x"
+
+    @property
+    def seconds(self) -> float:
+        return sum(s.seconds for s in self.stages.values())
+
+    @classmethod
+    def from_json(cls, data: dict) -> CaseResult:
+        stages = {k: StageResult(**v) for k, v in data.pop("stages").items()}
+        return cls(**data, stages=stages)
+
+
+def _max_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: macOS reports bytes where linux reports kilobytes.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _run_case(key: Key, source: str, records: int, results: Connection) -> None:
+    """Body of the child process, timing each stage in turn."""
+    sys.path.insert(0, str(ROOT))
+    solution = SOLUTIONS[key]
+    module = solution.load()
+
+    timings = {}
+    data = None
+    for stage in STAGES:
+        # NOTE: `ru_maxrss` only ever grows, so a stage that stays within the
+        # peak of an earlier one reports nothing rather than that peak again.
+        before = _max_rss_kb()
+        start = time.perf_counter()
+        match stage:
+            case "read":
+                data = solution.read(module, source)
+            case "parse":
+                data = solution.parse(module, data)
+            case "solve":
+                data = solution.solve(module, data)
+        elapsed = time.perf_counter() - start
+        timings[stage] = asdict(
+            StageResult(
+                seconds=elapsed,
+                rss_increase_kb=_max_rss_kb() - before,
+                ops_per_sec=records / elapsed if elapsed else 0.0,
+            )
+        )
+    results.send(timings)
+
+
+def run_case(
+    solution: Solution,
+    source: Path,
+    scale: int,
+    records: int,
+    timeout: float | None,
+) -> CaseResult:
+    result = CaseResult(solution.day, solution.part, scale, records)
+    context = multiprocessing.get_context("spawn")
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_case,
+        args=(solution.key, str(source), records, writer),
+        daemon=True,
+    )
+    process.start()
+    writer.close()
+
+    ready = wait([reader, process.sentinel], timeout)
+    if reader in ready:
+        try:
+            timings = reader.recv()
+        except EOFError:
+            result.status = "error"
+        else:
+            result.stages = {k: StageResult(**v) for k, v in timings.items()}
+    elif ready:
+        result.status = "error"
+    else:
+        result.status = "timeout"
+
+    process.terminate()
+    process.join()
+    return result
+
+
+def prepare(workspace: Path, day: int, scale: int, seed: int | None) -> Path:
+    """The input of `day` to benchmark against.
+
+    The puzzle input is used as is for a scale of 1 unless a `seed` is given,
+    otherwise an input of that size is generated into `workspace`.
+    """
+    if scale == 1 and seed is None:
+        return ROOT / f"d{day}" / "input.txt"
+
+    target = workspace / f"d{day}.txt"
+    generate.write(day, target, size=scale, seed=seed or 0)
+    return target
+
+
+def benchmark(
+    solutions: Iterable[Solution],
+    scales: Iterable[int],
+    timeout: float | None = None,
+    repeat: int = 1,
+    seed: int | None = None,
+) -> Iterator[CaseResult]:
+    scales = sorted(scales)
+    for solution in solutions:
+        for scale in scales:
+            with tempfile.TemporaryDirectory() as workspace:
+                source = prepare(Path(workspace), solution.day, scale, seed)
+                records = count_records(source)
+                runs = [
+                    run_case(solution, source, scale, records, timeout)
+                    for _ in range(repeat)
+                ]
+
+            yield best(runs)
+
+
+def best(runs: list[CaseResult]) -> CaseResult:
+    """Fastest time of each stage across repeated runs of the same case."""
+    if any(run.status != "ok" for run in runs):
+        return next(run for run in runs if run.status != "ok")
+
+    result = runs[0]
+    for stage in STAGES:
+        result.stages[stage] = min((run.stages[stage] for run in runs), key=_seconds)
+    return result
+
+
+def _seconds(stage: StageResult) -> float:
+    return stage.seconds
+
+
+def regressions(
+    current: Iterable[CaseResult],
+    baseline: Iterable[CaseResult],
+    threshold: float,
+) -> Iterator[tuple[CaseResult, CaseResult]]:
+    """Cases that are slower than the baseline by more than `threshold`.
+
+    >>> old = CaseResult(1, "1", 1, stages={"solve": StageResult(1.0, 0, 0)})
+    >>> new = CaseResult(1, "1", 1, stages={"solve": StageResult(1.5, 0, 0)})
+    >>> [r.key for r, _ in regressions([new], [old], threshold=0.2)]
+    ['d1.part1@1x']
+    >>> list(regressions([new], [old], threshold=0.6))
+    []
+    """
+    previous = {b.key: b for b in baseline if b.status == "ok"}
+    for result in current:
+        if result.status != "ok" or result.key not in previous:
+            continue
+
+        before = previous[result.key]
+        if result.seconds > before.seconds * (1 + threshold):
+            yield result, before
+
+
+def format_result(result: CaseResult) -> str:
+    if result.status != "ok":
+        return f"{result.key:<20} {result.status}"
+
+    stages = "  ".join(
+        f"{name} {s.seconds:8.4f}s {s.ops_per_sec:12.0f}/s +{s.rss_increase_kb / 1024:7.1f}MB"
+        for name, s in result.stages.items()
+    )
+    return f"{result.key:<20} {stages}"
+
+
+def save(path: Path, results: list[CaseResult]) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": [asdict(r) for r in results],
+            },
+            indent=2,
+        )
+    )
+
+
+def load(path: Path) -> list[CaseResult]:
+    return [CaseResult.from_json(r) for r in json.loads(path.read_text())["results"]]
+
+
+def select(days: Iterable[int]) -> list[Solution]:
+    days = set(days)
+    return [s for s in SOLUTIONS.values() if not days or s.day in days]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m advent2021.bench")
+    parser.add_argument("days", nargs="*", type=int, help="days to run, default all")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=None, help="per case")
+    parser.add_argument(
+        "--seed", type=int, help="generate inputs with this seed, even for 1x"
+    )
+    parser.add_argument("--save", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON baseline to compare")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = []
+    for result in benchmark(
+        select(args.days), args.scales, args.timeout, args.repeat, args.seed
+    ):
+        print(format_result(result), flush=True)
+        results.append(result)
+
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        slower = list(regressions(results, load(args.compare), args.threshold))
+        for result, before in slower:
+            print(
+                f"SLOWER {result.key}: {before.seconds:.4f}s -> {result.seconds:.4f}s"
+            )
+        return 1 if slower else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""On-disk cache of answers, addressed by what the answer depends on.
+
+The key of an answer is the SHA-256 of the input along with the source of the
+solution, every module of this repository it imports (such as its `part1`)
+and the registry of stages. Changing any of them changes the key, so entries
+never need invalidating, only evicting. The least recently used entries are
+evicted once the cache grows past its size limit.
+
+>>> import tempfile
+>>> with tempfile.TemporaryDirectory() as directory:
+...     cache = Cache(Path(directory))
+...     cache["abc"] = 42
+...     cache["abc"], "def" in cache
+(42, False)
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Final
+
+from advent2021 import loader
+from advent2021.solutions import ROOT, Solution
+
+DIRECTORY: Final[Path] = ROOT / ".advent2021" / "cache"
+MAX_BYTES: Final[int] = 16 * 1024 * 1024
+SUFFIX: Final[str] = ".pickle"
+
+
+def _module_path(name: str) -> Path | None:
+    """Path of the module `name` if it is part of this repository."""
+    base = ROOT.joinpath(*name.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def dependencies(path: Path) -> set[Path]:
+    """`path` and every module of this repository it imports, recursively.
+
+    >>> paths = dependencies(ROOT / "d6" / "part2.py")
+    >>> sorted(p.relative_to(ROOT).as_posix() for p in paths)
+    ... # doctest: +NORMALIZE_WHITESPACE
+    ['advent2021/__init__.py', 'advent2021/loader.py', 'd6/part1.py', 'd6/part2.py',
+     'd6/population.py']
+    """
+    found: set[Path] = set()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        if current in found:
+            continue
+
+        found.add(current)
+        for node in ast.walk(ast.parse(current.read_bytes())):
+            names = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+                names += [f"{node.module}.{alias.name}" for alias in node.names]
+
+            pending.extend(p for n in names if (p := _module_path(n)) is not None)
+
+    return found
+
+
+def key(solution: Solution, source: loader.Source) -> str | None:
+    """Key of the answer of `solution` for `source`, `None` for stdin."""
+    if not isinstance(source, (str, os.PathLike)) or source == loader.STDIN:
+        return None
+
+    digest = hashlib.sha256(f"{solution.day}.{solution.part}\0".encode())
+    modules = dependencies(solution.path) | {ROOT / "advent2021" / "solutions.py"}
+    for path in sorted(modules):
+        digest.update(path.relative_to(ROOT).as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+
+    for chunk in loader.chunks(source):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Cache:
+    def __init__(self, directory: Path = DIRECTORY, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def __getitem__(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+        # NOTE: The modified time doubles as the last time the entry was used.
+        path.touch()
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # NOTE: Write then rename so concurrent readers never see partial files.
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            pickle.dump(value, f)
+        os.replace(f.name, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        entries = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
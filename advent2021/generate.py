@@ -0,0 +1,691 @@
+"""Generate valid puzzle inputs of arbitrary size.
+
+Usage (from the repository root):
+
+    $ python -m advent2021.generate 9 --size 100 --seed 1 -o big.txt
+
+`size` scales the input relative to the real puzzle: a size of 1 is roughly
+as large as the puzzle input, grids grow in area and line based inputs grow
+in number of lines. Inputs are written as they are generated so that very
+large inputs never have to be held in memory. The exceptions are days where
+the whole input is one structure (d13, d16 and d19).
+
+Some days have no meaningful size (d21, d23 and d24), for those `size` is
+ignored. d24 is also constrained to the digit relations that d24/part1.py
+hard-codes, as that solution only works for programs of that shape. Like the
+puzzle, d11 grids are random so are not guaranteed to ever synchronise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+import string
+import sys
+from pathlib import Path
+from typing import IO, Callable, Final, Iterable, Iterator, TypeAlias
+
+Generator: TypeAlias = Callable[[random.Random, int], Iterator[str]]
+
+SEGMENTS: Final[tuple[str, ...]] = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+
+CLOSER: Final[dict[str, str]] = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+# NOTE: Pairs of (push, pop) digits and the difference between them.
+ALU_PAIRS: Final[tuple[tuple[int, int, int], ...]] = (
+    (0, 13, 6),
+    (1, 12, -2),
+    (2, 11, 5),
+    (3, 4, -5),
+    (5, 10, 8),
+    (6, 7, -4),
+    (8, 9, 2),
+)
+
+
+def _lines(lines: Iterable[str]) -> Iterator[str]:
+    """Join lines with newlines as they are produced.
+
+    >>> "".join(_lines(["a", "b"]))
+    'a\\nb'
+    """
+    for i, line in enumerate(lines):
+        if i:
+            yield "\n"
+        yield line
+
+
+def _chunked(values: Iterable[int], separator: str = ",") -> Iterator[str]:
+    """
+    >>> "".join(_chunked(range(3)))
+    '0,1,2'
+    """
+    first = True
+    for batch in _batches(values, 4096):
+        if not first:
+            yield separator
+        first = False
+        yield separator.join(str(v) for v in batch)
+
+
+def _batches(values: Iterable[int], n: int) -> Iterator[list[int]]:
+    iterator = iter(values)
+    while batch := list(itertools.islice(iterator, n)):
+        yield batch
+
+
+def _side(base: int, size: int) -> int:
+    """Side of a square grid whose area grows linearly with `size`.
+
+    >>> _side(100, 100)
+    1000
+    """
+    return max(1, round(base * math.sqrt(size)))
+
+
+def _grid(rng: random.Random, height: int, width: int, cells: str, weights=None):
+    for _ in range(height):
+        yield "".join(rng.choices(cells, weights=weights, k=width))
+
+
+def d1(rng: random.Random, size: int) -> Iterator[str]:
+    depth = rng.randint(100, 200)
+
+    def depths():
+        nonlocal depth
+        for _ in range(2000 * size):
+            depth = max(0, depth + rng.randint(-5, 20))
+            yield str(depth)
+
+    return _lines(depths())
+
+
+def d2(rng: random.Random, size: int) -> Iterator[str]:
+    def commands():
+        aim = 0
+        for _ in range(1000 * size):
+            command = rng.choice(("forward", "down", "up"))
+            value = rng.randint(1, 9)
+            if command == "up" and value > aim:
+                command = "down"
+            aim += {"forward": 0, "down": value, "up": -value}[command]
+            yield f"{command} {value}"
+
+    return _lines(commands())
+
+
+def d3(rng: random.Random, size: int) -> Iterator[str]:
+    count = 1000 * size
+    # NOTE: Numbers have to be unique for the ratings to narrow down to one.
+    bits = max(12, (count * 4).bit_length())
+    # NOTE: An odd multiplier and a shift-xor are both permutations modulo
+    # 2**bits, so the numbers are unique without keeping any of them.
+    multiplier, offset = rng.randrange(1, 2**bits, 2), rng.randrange(2**bits)
+
+    def numbers() -> Iterator[int]:
+        for i in range(count):
+            n = (multiplier * i + offset) % 2**bits
+            yield n ^ n >> (bits // 2)
+
+    return _lines(f"{n:0{bits}b}" for n in numbers())
+
+
+def d4(rng: random.Random, size: int) -> Iterator[str]:
+    calls = list(range(100))
+    rng.shuffle(calls)
+    yield ",".join(str(c) for c in calls)
+    for _ in range(100 * size):
+        values = rng.sample(range(100), 25)
+        yield "\n\n"
+        yield "\n".join(
+            " ".join(f"{v:2d}" for v in values[row * 5 : row * 5 + 5])
+            for row in range(5)
+        )
+
+
+def d5(rng: random.Random, size: int) -> Iterator[str]:
+    extent = _side(1000, size)
+
+    def segments():
+        for _ in range(500 * size):
+            x1, y1 = rng.randrange(extent), rng.randrange(extent)
+            dx, dy = rng.choice(((1, 0), (0, 1), (1, 1), (1, -1)))
+            length = rng.randint(1, extent // 3)
+            if dx:
+                length = min(length, extent - 1 - x1)
+            if dy == 1:
+                length = min(length, extent - 1 - y1)
+            if dy == -1:
+                length = min(length, y1)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+            if rng.random() < 0.5:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            yield f"{x1},{y1} -> {x2},{y2}"
+
+    return _lines(segments())
+
+
+def d6(rng: random.Random, size: int) -> Iterator[str]:
+    return _chunked(rng.randint(1, 5) for _ in range(300 * size))
+
+
+def d7(rng: random.Random, size: int) -> Iterator[str]:
+    return _chunked(
+        min(1999, int(rng.expovariate(1 / 400))) for _ in range(1000 * size)
+    )
+
+
+def d8(rng: random.Random, size: int) -> Iterator[str]:
+    def displays():
+        for _ in range(200 * size):
+            wires = list("abcdefg")
+            rng.shuffle(wires)
+            mapping = dict(zip("abcdefg", wires))
+
+            def scramble(digit: int) -> str:
+                pattern = [mapping[s] for s in SEGMENTS[digit]]
+                rng.shuffle(pattern)
+                return "".join(pattern)
+
+            patterns = [scramble(d) for d in rng.sample(range(10), 10)]
+            outputs = [scramble(rng.randrange(10)) for _ in range(4)]
+            yield f"{' '.join(patterns)} | {' '.join(outputs)}"
+
+    return _lines(displays())
+
+
+def _basins(rng: random.Random, height: int, width: int) -> Iterator[str]:
+    """Rows of small rectangular basins walled off by 9s.
+
+    Heights rise by one for every step away from the low point of a basin, so
+    like the puzzle every cell flows to exactly one low point.
+    """
+    row = 0
+    while row < height:
+        band = min(rng.randint(1, 5), height - row)
+        rows: list[list[str]] = [[] for _ in range(band)]
+        col = 0
+        while col < width:
+            span = min(rng.randint(1, 5), width - col)
+            low_row, low_col = rng.randrange(band), rng.randrange(span)
+            base = rng.randint(
+                0,
+                8 - max(low_row, band - 1 - low_row) - max(low_col, span - 1 - low_col),
+            )
+            for r, cells in enumerate(rows):
+                cells.extend(
+                    str(base + abs(r - low_row) + abs(c - low_col)) for c in range(span)
+                )
+            col += span
+            if col < width:
+                for cells in rows:
+                    cells.append("9")
+                col += 1
+
+        yield from ("".join(cells) for cells in rows)
+        row += band
+        if row < height:
+            yield "9" * width
+            row += 1
+
+
+def d9(rng: random.Random, size: int) -> Iterator[str]:
+    side = _side(100, size)
+    return _lines(_basins(rng, side, side))
+
+
+def _chunk(rng: random.Random, length: int) -> str:
+    stack: list[str] = []
+    line = []
+    for _ in range(length):
+        if stack and rng.random() < 0.45:
+            line.append(CLOSER[stack.pop()])
+        else:
+            stack.append(rng.choice(tuple(CLOSER)))
+            line.append(stack[-1])
+
+    if stack and rng.random() < 0.5:
+        # NOTE: Corrupt the line by closing with the wrong character.
+        wrong = [c for o, c in CLOSER.items() if o != stack[-1]]
+        line.append(rng.choice(wrong))
+        line.extend(rng.choice("([{<)]}>") for _ in range(rng.randint(0, 10)))
+    return "".join(line)
+
+
+def d10(rng: random.Random, size: int) -> Iterator[str]:
+    return _lines(_chunk(rng, rng.randint(80, 110)) for _ in range(100 * size))
+
+
+def d11(rng: random.Random, size: int) -> Iterator[str]:
+    side = _side(10, size)
+    return _lines(_grid(rng, side, side, string.digits))
+
+
+def _names(rng: random.Random, letters: str, count: int) -> list[str]:
+    names: set[str] = set()
+    length = 2
+    while len(names) < count:
+        if len(names) >= len(letters) ** length // 2:
+            length += 1
+        name = "".join(rng.choices(letters, k=length))
+        if name not in ("start", "end"):
+            names.add(name)
+    return sorted(names)
+
+
+def d12(rng: random.Random, size: int) -> Iterator[str]:
+    small = ["start", "end"] + _names(rng, string.ascii_lowercase, 4 + size)
+    big = _names(rng, string.ascii_uppercase, 2 + size // 4)
+    edges: set[tuple[str, str]] = {
+        ("start", rng.choice(small[2:])),
+        ("end", rng.choice(small[2:])),
+    }
+
+    # NOTE: Connect every cave, big caves are never adjacent to each other
+    # otherwise there would be infinitely many paths.
+    for cave in small[1:] + big:
+        others = small if cave in big else small + big
+        neighbour = rng.choice([o for o in others if o != cave])
+        edges.add((cave, neighbour))
+
+    for _ in range(len(small) + len(big)):
+        a, b = rng.choice(small), rng.choice(small + big)
+        if a != b:
+            edges.add((a, b))
+
+    return _lines(f"{a}-{b}" for a, b in edges)
+
+
+def d13(rng: random.Random, size: int) -> Iterator[str]:
+    width, height = 40, 6
+    axes = ["x", "y"] * 5 + ["y", "y"]
+
+    # NOTE: Work backwards from the final display, unfolding each fold.
+    folds = []
+    for axis in reversed(axes):
+        if axis == "x":
+            folds.append((axis, width))
+            width = 2 * width + 1
+        else:
+            folds.append((axis, height))
+            height = 2 * height + 1
+
+    dots = set()
+    for _ in range(900 * size):
+        x, y = rng.randrange(40), rng.randrange(6)
+        for axis, line in folds:
+            if rng.random() < 0.5:
+                continue
+            if axis == "x":
+                x = 2 * line - x
+            else:
+                y = 2 * line - y
+        dots.add((x, y))
+
+    yield from _lines(f"{x},{y}" for x, y in dots)
+    yield "\n\n"
+    yield from _lines(f"fold along {axis}={line}" for axis, line in reversed(folds))
+
+
+def d14(rng: random.Random, size: int) -> Iterator[str]:
+    elements = rng.sample(string.ascii_uppercase, min(26, 10 + size // 10))
+    for batch in _batches(range(20 * size), 4096):
+        yield "".join(rng.choices(elements, k=len(batch)))
+    yield "\n\n"
+    yield from _lines(
+        f"{a}{b} -> {rng.choice(elements)}"
+        for a, b in itertools.product(elements, repeat=2)
+    )
+
+
+def d15(rng: random.Random, size: int) -> Iterator[str]:
+    side = _side(100, size)
+    return _lines(_grid(rng, side, side, "123456789"))
+
+
+def _literal(rng: random.Random) -> str:
+    groups = rng.randint(1, 4)
+    value = rng.randrange(16**groups)
+    nibbles = f"{value:0{groups * 4}b}"
+    return "".join(
+        ("1" if i < groups - 1 else "0") + nibbles[i * 4 : i * 4 + 4]
+        for i in range(groups)
+    )
+
+
+def _split(rng: random.Random, total: int, parts: int) -> list[int]:
+    """Split `total` into `parts` positive integers.
+
+    >>> sum(_split(random.Random(0), 10, 3))
+    10
+    """
+    cuts = sorted(rng.sample(range(1, total), parts - 1))
+    return [b - a for a, b in zip([0] + cuts, cuts + [total])]
+
+
+def _packet(rng: random.Random, literals: int, depth: int) -> str:
+    version = f"{rng.randrange(8):03b}"
+    if literals == 1 or depth == 0:
+        return version + "100" + _literal(rng)
+
+    type_id = rng.choice((0, 1, 2, 3, 5, 6, 7))
+    if type_id >= 5:
+        parts = 2
+    else:
+        # NOTE: Few children per operator so that the tree grows deep.
+        parts = rng.randint(1, min(3, literals))
+        if type_id == 1:
+            parts = min(parts, 2)
+
+    if literals < parts:
+        return version + "100" + _literal(rng)
+
+    children = [_packet(rng, n, depth - 1) for n in _split(rng, literals, parts)]
+    content = "".join(children)
+    if len(content) < 2**15 and rng.random() < 0.5:
+        header = f"0{len(content):015b}"
+    else:
+        header = f"1{len(children):011b}"
+    return version + f"{type_id:03b}" + header + content
+
+
+def d16(rng: random.Random, size: int) -> Iterator[str]:
+    # NOTE: The solution parses recursively, keep well within the recursion limit.
+    bits = _packet(rng, 60 * size, depth=min(120, 10 + size))
+    bits += "0" * (-len(bits) % 4)
+    for i in range(0, len(bits), 4096):
+        chunk = bits[i : i + 4096]
+        yield "".join(f"{int(chunk[j : j + 4], 2):X}" for j in range(0, len(chunk), 4))
+
+
+def d17(rng: random.Random, size: int) -> Iterator[str]:
+    x0 = round(rng.uniform(100, 200) * size)
+    x1 = x0 + round(rng.uniform(20, 40) * size)
+    y0 = -round(rng.uniform(80, 120) * size)
+    y1 = y0 + round(rng.uniform(20, 40) * size)
+    yield f"target area: x={x0}..{x1}, y={y0}..{y1}"
+
+
+def _snailfish(rng: random.Random, depth: int = 0) -> str:
+    if depth == 4 or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return f"[{_snailfish(rng, depth + 1)},{_snailfish(rng, depth + 1)}]"
+
+
+def d18(rng: random.Random, size: int) -> Iterator[str]:
+    return _lines(_snailfish(rng) for _ in range(100 * size))
+
+
+Vector: TypeAlias = tuple[int, int, int]
+
+
+def _rotations() -> list[Callable[[Vector], Vector]]:
+    """All 24 rotations, as axis permutations with signs keeping handedness."""
+    rotations = []
+    for permutation in itertools.permutations(range(3)):
+        parity = sum(
+            1
+            for i, j in itertools.combinations(range(3), 2)
+            if permutation[i] > permutation[j]
+        )
+        for signs in itertools.product((1, -1), repeat=3):
+            if (-1) ** parity * math.prod(signs) != 1:
+                continue
+            rotations.append(
+                lambda v, p=permutation, s=signs: (
+                    s[0] * v[p[0]],
+                    s[1] * v[p[1]],
+                    s[2] * v[p[2]],
+                )
+            )
+    return rotations
+
+
+def _within(centre: Vector, point: Vector, reach: int = 1000) -> bool:
+    return all(abs(c - p) <= reach for c, p in zip(centre, point))
+
+
+class _Space:
+    """Points bucketed into cubes so that nearby points are cheap to find."""
+
+    def __init__(self, side: int = 1000) -> None:
+        self.side = side
+        self.cells: dict[Vector, list[Vector]] = {}
+
+    def _cell(self, point: Vector) -> Vector:
+        return point[0] // self.side, point[1] // self.side, point[2] // self.side
+
+    def add(self, point: Vector) -> None:
+        self.cells.setdefault(self._cell(point), []).append(point)
+
+    def near(self, centre: Vector, reach: int = 1000) -> list[Vector]:
+        """
+        >>> space = _Space()
+        >>> space.add((0, 0, 0))
+        >>> space.add((2000, 0, 0))
+        >>> space.near((999, 0, 0))
+        [(0, 0, 0)]
+        """
+        x, y, z = self._cell(centre)
+        cells = -(-reach // self.side)
+        return [
+            p
+            for dx, dy, dz in itertools.product(range(-cells, cells + 1), repeat=3)
+            for p in self.cells.get((x + dx, y + dy, z + dz), ())
+            if _within(centre, p, reach)
+        ]
+
+
+def d19(rng: random.Random, size: int) -> Iterator[str]:
+    def point(centre: Vector) -> Vector:
+        return (
+            centre[0] + rng.randint(-1000, 1000),
+            centre[1] + rng.randint(-1000, 1000),
+            centre[2] + rng.randint(-1000, 1000),
+        )
+
+    scanners, beacons = _Space(), _Space()
+    order: list[Vector] = [(0, 0, 0)]
+    scanners.add(order[0])
+    for _ in range(26):
+        beacons.add(point(order[0]))
+
+    # NOTE: Scanners are spread out like the puzzle, each seeing about 26
+    # beacons, 12 of which are shared with the scanner it was placed next to.
+    while len(order) < 30 * size:
+        parent = rng.choice(order)
+        offset = [rng.randint(-1300, 1300) for _ in range(3)]
+        offset[rng.randrange(3)] = rng.choice((-1, 1)) * rng.randint(1000, 1300)
+        scanner = parent[0] + offset[0], parent[1] + offset[1], parent[2] + offset[2]
+        if scanners.near(scanner, 999):
+            continue
+
+        shared = [b for b in beacons.near(parent) if _within(scanner, b)]
+        while len(shared) < 12:
+            candidate = point(scanner)
+            if _within(parent, candidate):
+                beacons.add(candidate)
+                shared.append(candidate)
+
+        for _ in range(rng.randint(10, 16)):
+            candidate = point(scanner)
+            if not scanners.near(candidate):
+                beacons.add(candidate)
+
+        scanners.add(scanner)
+        order.append(scanner)
+
+    rotations = _rotations()
+    for i, scanner in enumerate(order):
+        rotate = rng.choice(rotations)
+        if i:
+            yield "\n\n"
+        yield f"--- scanner {i} ---"
+        for beacon in beacons.near(scanner):
+            x, y, z = rotate(
+                (beacon[0] - scanner[0], beacon[1] - scanner[1], beacon[2] - scanner[2])
+            )
+            yield f"\n{x},{y},{z}"
+
+
+def d20(rng: random.Random, size: int) -> Iterator[str]:
+    algorithm = rng.choices("#.", k=512)
+    # NOTE: Like the puzzle, make the infinite background flash on and off.
+    algorithm[0], algorithm[511] = "#", "."
+    yield "".join(algorithm)
+    yield "\n\n"
+    side = _side(100, size)
+    yield from _lines(_grid(rng, side, side, "#."))
+
+
+def d21(rng: random.Random, size: int) -> Iterator[str]:
+    return _lines(f"Player {p} starting position: {rng.randint(1, 10)}" for p in (1, 2))
+
+
+def _cuboid(rng: random.Random, reach: int, extent: int) -> str:
+    state = rng.choice(("on", "off"))
+    ranges = []
+    for axis in "xyz":
+        low = rng.randint(-reach, reach - extent)
+        ranges.append(f"{axis}={low}..{low + rng.randint(1, extent)}")
+    return f"{state} {','.join(ranges)}"
+
+
+def d22(rng: random.Random, size: int) -> Iterator[str]:
+    def steps():
+        for _ in range(20):
+            yield _cuboid(rng, 50, 50)
+        for _ in range(400 * size):
+            yield _cuboid(rng, 100000, 30000)
+
+    return _lines(steps())
+
+
+def d23(rng: random.Random, size: int) -> Iterator[str]:
+    amphipods = list("AABBCCDD")
+    rng.shuffle(amphipods)
+    top, bottom = amphipods[::2], amphipods[1::2]
+    return _lines(
+        [
+            "#############",
+            "#...........#",
+            f"###{'#'.join(top)}###",
+            f"  #{'#'.join(bottom)}#",
+            "  #########",
+        ]
+    )
+
+
+def _alu_block(divide: int, check: int, offset: int) -> Iterator[str]:
+    yield "inp w"
+    yield "mul x 0"
+    yield "add x z"
+    yield "mod x 26"
+    yield f"div z {divide}"
+    yield f"add x {check}"
+    yield "eql x w"
+    yield "eql x 0"
+    yield "mul y 0"
+    yield "add y 25"
+    yield "mul y x"
+    yield "add y 1"
+    yield "mul z y"
+    yield "mul y 0"
+    yield "add y w"
+    yield f"add y {offset}"
+    yield "mul y x"
+    yield "add z y"
+
+
+def d24(rng: random.Random, size: int) -> Iterator[str]:
+    blocks: dict[int, tuple[int, int, int]] = {}
+    for push, pop, difference in ALU_PAIRS:
+        offset = rng.randint(1, 16)
+        # NOTE: digit[pop] == digit[push] + offset[push] + check[pop]
+        blocks[push] = 1, rng.randint(10, 16), offset
+        blocks[pop] = 26, difference - offset, rng.randint(1, 16)
+
+    return _lines(line for i in range(14) for line in _alu_block(*blocks[i]))
+
+
+def d25(rng: random.Random, size: int) -> Iterator[str]:
+    width, height = _side(139, size), _side(137, size)
+    return _lines(_grid(rng, height, width, ".>v", weights=[9, 5, 5]))
+
+
+GENERATORS: Final[dict[int, Generator]] = {
+    1: d1,
+    2: d2,
+    3: d3,
+    4: d4,
+    5: d5,
+    6: d6,
+    7: d7,
+    8: d8,
+    9: d9,
+    10: d10,
+    11: d11,
+    12: d12,
+    13: d13,
+    14: d14,
+    15: d15,
+    16: d16,
+    17: d17,
+    18: d18,
+    19: d19,
+    20: d20,
+    21: d21,
+    22: d22,
+    23: d23,
+    24: d24,
+    25: d25,
+}
+
+
+def generate(day: int, size: int = 1, seed: int = 0) -> Iterator[str]:
+    """Chunks of text making up the input of `day`.
+
+    >>> "".join(generate(6, seed=1)) == "".join(generate(6, seed=1))
+    True
+    >>> "".join(generate(21, seed=1))
+    'Player 1 starting position: 3\\nPlayer 2 starting position: 10'
+    """
+    return GENERATORS[day](random.Random(seed), size)
+
+
+def write(day: int, output: IO[str] | Path, size: int = 1, seed: int = 0) -> None:
+    if isinstance(output, Path):
+        with output.open("w") as f:
+            return write(day, f, size, seed)
+
+    for chunk in generate(day, size, seed):
+        output.write(chunk)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m advent2021.generate")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("--size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="-", help="file, default stdout")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == "-" else Path(args.output)
+    write(args.day, output, args.size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Dense grids of small integers shared by the grid based days.
+
+Cells are stored row by row in one contiguous buffer: a numpy array when numpy
+is installed, an `array.array` otherwise. A 10k x 10k grid of digits then
+takes 100MB instead of the gigabytes a list of lists of ints would.
+
+Single cells are indexed by `(row, col)`. Whole grid operations go through
+`array`, a 2D numpy view of the same buffer, and `shifted`/`neighbours`, which
+line every cell up with its neighbours so they can be compared in one go:
+
+>>> grid = Grid.parse("123\\n456\\n")
+>>> grid.height, grid.width, grid[1, 2]
+(2, 3, 6)
+>>> sorted(grid.adjacent((0, 0)))
+[(0, 1), (1, 0)]
+>>> grid.shifted(0, 1, fill=0).tolist()
+[[2, 3, 0], [5, 6, 0]]
+"""
+
+from __future__ import annotations
+
+import array
+import itertools
+from typing import Any, Iterable, Iterator, TypeAlias
+
+from advent2021 import loader
+
+# NOTE: numpy is optional, without it only single cell access is available.
+from advent2021.optional import numpy
+
+Coord: TypeAlias = tuple[int, int]
+Direction: TypeAlias = tuple[int, int]
+
+ORTHOGONAL: tuple[Direction, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL: tuple[Direction, ...] = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+SURROUNDING: tuple[Direction, ...] = ORTHOGONAL + DIAGONAL
+
+DIGITS = b"0123456789"
+
+
+class Grid:
+    """A `height` x `width` grid of integers of one `array` typecode."""
+
+    __slots__ = ("cells", "height", "width")
+
+    def __init__(self, cells: Any, height: int, width: int) -> None:
+        if len(cells) != height * width:
+            raise ValueError(f"{len(cells)} cells do not fit {height}x{width}")
+        self.cells = cells
+        self.height = height
+        self.width = width
+
+    @classmethod
+    def full(cls, height: int, width: int, value: int = 0, typecode: str = "b") -> Grid:
+        if numpy is not None:
+            return cls(numpy.full(height * width, value, typecode), height, width)
+        return cls(array.array(typecode, [value]) * (height * width), height, width)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]], typecode: str = "b") -> Grid:
+        """
+        >>> Grid.from_rows([[1, 2], [3, 4]])
+        Grid([[1, 2], [3, 4]])
+        """
+        rows = [list(row) for row in rows]
+        height, width = len(rows), len(rows[0]) if rows else 0
+        if numpy is not None:
+            cells = numpy.array(rows, typecode).reshape(height * width)
+        else:
+            cells = array.array(typecode, itertools.chain.from_iterable(rows))
+        return cls(cells, height, width)
+
+    @classmethod
+    def parse(cls, text: str | bytes, symbols: bytes = DIGITS) -> Grid:
+        """Grid of one symbol per cell, valued by its index in `symbols`.
+
+        The text is converted in bulk rather than character by character.
+
+        >>> Grid.parse(".>v\\nv..", symbols=b".>v")
+        Grid([[0, 1, 2], [2, 0, 0]])
+        """
+        if isinstance(text, str):
+            text = text.encode()
+
+        rows = text.rstrip(b"\n").split(b"\n")
+        height, width = len(rows), len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("rows are not all the same width")
+
+        values = b"".join(rows).translate(
+            bytes.maketrans(symbols, bytes(range(len(symbols))))
+        )
+        if numpy is not None:
+            return cls(numpy.frombuffer(values, "b").copy(), height, width)
+        return cls(array.array("b", values), height, width)
+
+    @classmethod
+    def read(cls, source: loader.Source, symbols: bytes = DIGITS) -> Grid:
+        return cls.parse(b"".join(loader.chunks(source)), symbols)
+
+    def __getitem__(self, coord: Coord) -> int:
+        index = coord[0] * self.width + coord[1]
+        if numpy is not None:
+            return self.cells.item(index)
+        return self.cells[index]
+
+    def __setitem__(self, coord: Coord, value: int) -> None:
+        self.cells[coord[0] * self.width + coord[1]] = value
+
+    def __contains__(self, coord: Coord) -> bool:
+        return 0 <= coord[0] < self.height and 0 <= coord[1] < self.width
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        if (self.height, self.width) != (other.height, other.width):
+            return False
+        if numpy is not None:
+            return bool(numpy.array_equal(self.cells, other.cells))
+        return self.cells == other.cells
+
+    def __repr__(self) -> str:
+        return f"Grid({self.rows()!r})"
+
+    @property
+    def typecode(self) -> str:
+        if numpy is not None:
+            return self.cells.dtype.char
+        return self.cells.typecode
+
+    def copy(self) -> Grid:
+        cells = self.cells.copy() if numpy is not None else self.cells[:]
+        return Grid(cells, self.height, self.width)
+
+    def rows(self) -> list[list[int]]:
+        return [
+            self.cells[r * self.width : (r + 1) * self.width].tolist()
+            for r in range(self.height)
+        ]
+
+    def keys(self) -> Iterator[Coord]:
+        return itertools.product(range(self.height), range(self.width))
+
+    def items(self) -> Iterator[tuple[Coord, int]]:
+        return zip(self.keys(), self.cells.tolist())
+
+    def adjacent(
+        self, coord: Coord, directions: Iterable[Direction] = ORTHOGONAL
+    ) -> Iterator[Coord]:
+        """Neighbours of `coord` that are inside the grid."""
+        row, col = coord
+        for dr, dc in directions:
+            if 0 <= row + dr < self.height and 0 <= col + dc < self.width:
+                yield row + dr, col + dc
+
+    @property
+    def array(self) -> numpy.ndarray:
+        """The cells as a `height` x `width` numpy array sharing memory."""
+        if numpy is None:
+            raise ModuleNotFoundError("whole grid operations require numpy")
+        return self.cells.reshape(self.height, self.width)
+
+    def shifted(self, dr: int, dc: int, fill: int) -> numpy.ndarray:
+        """The neighbour `(dr, dc)` away from every cell, `fill` off the grid."""
+        cells = self.array
+        shifted = numpy.full_like(cells, fill)
+        rows, cols = _overlap(dr, self.height), _overlap(dc, self.width)
+        shifted[rows[0], cols[0]] = cells[rows[1], cols[1]]
+        return shifted
+
+    def neighbours(
+        self, fill: int, directions: Iterable[Direction] = ORTHOGONAL
+    ) -> numpy.ndarray:
+        """Every neighbour of every cell, stacked along the first axis.
+
+        >>> Grid.parse("12\\n34").neighbours(fill=9).min(axis=0).tolist()
+        [[2, 1], [1, 2]]
+        """
+        shifted = [self.shifted(dr, dc, fill) for dr, dc in directions]
+        return numpy.stack(shifted)
+
+
+def _overlap(offset: int, length: int) -> tuple[slice, slice]:
+    """Slices of the cells and their neighbours `offset` away along one axis."""
+    if offset >= 0:
+        return slice(0, length - offset), slice(offset, length)
+    return slice(-offset, length), slice(0, length + offset)
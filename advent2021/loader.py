@@ -0,0 +1,110 @@
+"""Load puzzle inputs independently of the working directory.
+
+A source is either a path, `-` for stdin or a memory-mapped file. Inputs are
+read lazily in fixed size chunks, so line based inputs of any size can be
+streamed in constant memory.
+
+>>> import tempfile
+>>> with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+...     _ = f.write("1\\n2\\n\\n3")
+...     f.flush()
+...     with mapped(f.name) as m:
+...         list(lines(f.name)) == list(lines(m)) == ["1", "2", "", "3"]
+True
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Final, Iterator, TypeAlias
+
+Source: TypeAlias = str | os.PathLike | mmap.mmap
+
+STDIN: Final[str] = "-"
+CHUNK_SIZE: Final[int] = 1 << 16
+
+
+def default(file: str) -> Path:
+    """The `input.txt` that sits next to the solution `file`."""
+    return Path(file).with_name("input.txt")
+
+
+def from_argv(file: str, argv: list[str] | None = None) -> Source:
+    """The source given on the command line, or the default of `file`.
+
+    >>> from_argv("d1/part1.py", ["-"])
+    '-'
+    >>> from_argv("d1/part1.py", []).as_posix()
+    'd1/input.txt'
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    return argv[0] if argv else default(file)
+
+
+@contextmanager
+def mapped(path: str | os.PathLike) -> Iterator[mmap.mmap]:
+    """Memory-map the file at `path` for reading."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            yield m
+
+
+def chunks(source: Source, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Raw bytes of `source` in chunks of at most `size`."""
+    if isinstance(source, mmap.mmap):
+        for start in range(0, len(source), size):
+            yield source[start : start + size]
+        return
+
+    if source == STDIN:
+        yield from iter(partial(sys.stdin.buffer.read, size), b"")
+        return
+
+    with open(source, "rb") as f:
+        yield from iter(partial(f.read, size), b"")
+
+
+def line_chunks(source: Source, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Raw bytes of `source` in chunks of whole lines, of about `size`.
+
+    Every chunk ends in a newline: a last line without one gets one, unless
+    it is blank, and reads that hold no newline are carried into the next.
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile("wb") as f:
+    ...     _ = f.write(b"12\\n345\\n6")
+    ...     f.flush()
+    ...     list(line_chunks(f.name, 2))
+    [b'12\\n', b'345\\n', b'6\\n']
+    """
+    tail = b""
+    for chunk in chunks(source, size):
+        if tail:
+            chunk = tail + chunk
+        end = chunk.rfind(b"\n") + 1
+        tail = chunk[end:]
+        if end:
+            yield chunk[:end]
+
+    if tail.strip():
+        yield tail + b"\n"
+
+
+def lines(source: Source) -> Iterator[str]:
+    """Lines of `source` without line endings.
+
+    Chunks are only split at newlines, so each line is decoded and split
+    once rather than read and then stripped.
+    """
+    for chunk in line_chunks(source):
+        yield from chunk.decode().splitlines()
+
+
+def text(source: Source) -> str:
+    """The whole of `source` as a string."""
+    return b"".join(chunks(source)).decode()
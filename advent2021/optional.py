@@ -0,0 +1,9 @@
+"""Optional dependencies, `None` when they are not installed.
+
+Solutions check for `None` and fall back to pure Python.
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
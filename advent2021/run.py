@@ -0,0 +1,369 @@
+"""Run solutions and report where the time and memory goes.
+
+Usage (from the repository root):
+
+    $ python -m advent2021 run 5 2
+    $ python -m advent2021 run 1-5
+    $ python -m advent2021 run 15 1 --input big.txt
+    $ python -m advent2021 run all --jobs 8 --timeout 60
+
+Each solution is only imported when it is run, so the import phase includes
+the solution module and anything it pulls in for the first time. Peak memory
+is measured per phase with `tracemalloc`, which slows allocation heavy code
+down; pass `--no-memory` for timings closer to a plain run.
+
+With `--jobs` solutions run in a process pool instead, with their output
+captured and a summary table printed at the end. The duration of every run
+is recorded so that the next run can start the slowest solutions first.
+Timeouts are raised inside the worker with `SIGALRM`, so they only interrupt
+Python code and are only available on unix.
+
+Answers are cached on disk by `advent2021.cache`, so unchanged solutions on
+unchanged inputs return straight away; pass `--no-cache` to always run them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import math
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, Final, Iterable, Iterator
+
+from advent2021 import cache, loader
+from advent2021.solutions import ROOT, SOLUTIONS, Key, Solution
+
+DURATIONS: Final[Path] = ROOT / ".advent2021" / "durations.json"
+
+
+@dataclass
+class Phase:
+    seconds: float
+    peak_bytes: int | None = None
+
+
+@dataclass
+class Report:
+    day: int
+    part: str
+    answer: Any = None
+    phases: dict[str, Phase] = field(default_factory=dict)
+    status: str = "ok"
+    output: str = ""
+    cached: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"d{self.day}.part{self.part}"
+
+    @property
+    def seconds(self) -> float:
+        return sum(p.seconds for p in self.phases.values())
+
+    @property
+    def label(self) -> str:
+        return "cached" if self.cached else self.status
+
+
+@contextmanager
+def _measure(phases: dict[str, Phase], name: str, memory: bool) -> Iterator[None]:
+    if memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
+    phases[name] = Phase(elapsed, peak)
+
+
+@contextmanager
+def _shared(source: loader.Source | None) -> Iterator[loader.Source | None]:
+    """`source`, with stdin first copied to a temporary file so that every
+    solution reads all of it rather than the first using it up."""
+    if source != loader.STDIN:
+        yield source
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".txt") as f:
+        shutil.copyfileobj(sys.stdin.buffer, f)
+        f.flush()
+        yield f.name
+
+
+def run(
+    solution: Solution,
+    source: loader.Source | None = None,
+    memory: bool = True,
+    results: cache.Cache | None = None,
+) -> Report:
+    """Run every phase of `solution`, timing each one.
+
+    The answer is looked up in `results` first if given, and stored there
+    once solved.
+    """
+    source = solution.input if source is None else source
+    report = Report(solution.day, solution.part)
+    start = time.perf_counter()
+    key = None if results is None else cache.key(solution, source)
+    if results is not None and key is not None:
+        try:
+            report.answer = results[key]
+        except KeyError:
+            pass
+        else:
+            report.phases["cache"] = Phase(time.perf_counter() - start)
+            report.cached = True
+            return report
+
+    if memory:
+        tracemalloc.start()
+    try:
+        with _measure(report.phases, "import", memory):
+            module = solution.load()
+        with _measure(report.phases, "read", memory):
+            data = solution.read(module, source)
+        with _measure(report.phases, "parse", memory):
+            data = solution.parse(module, data)
+        with _measure(report.phases, "solve", memory):
+            report.answer = solution.solve(module, data)
+    finally:
+        if memory:
+            tracemalloc.stop()
+
+    if results is not None and key is not None:
+        results[key] = report.answer
+    return report
+
+
+def _alarm(signum: int, frame: FrameType | None) -> None:
+    raise TimeoutError
+
+
+def _run_task(
+    key: Key,
+    source: loader.Source | None,
+    memory: bool,
+    timeout: float | None,
+    results: cache.Cache | None,
+) -> Report:
+    """Body of a pool worker, capturing everything the solution prints."""
+    solution = SOLUTIONS[key]
+    output = io.StringIO()
+    if timeout:
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            report = run(solution, source, memory, results)
+    except TimeoutError:
+        report = Report(solution.day, solution.part, status="timeout")
+        report.phases["total"] = Phase(timeout or 0.0)
+    except Exception:
+        report = Report(solution.day, solution.part, status="error")
+        output.write(traceback.format_exc())
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    report.output = output.getvalue()
+    return report
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def save_durations(path: Path, reports: Iterable[Report]) -> None:
+    """Record how long each solution took, keeping other solutions as is."""
+    durations = load_durations(path)
+    durations.update(
+        {r.name: r.seconds for r in reports if r.status != "error" and not r.cached}
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def longest_first(
+    solutions: Iterable[Solution], durations: dict[str, float]
+) -> list[Solution]:
+    """Slowest solutions first, solutions that never ran before all of them.
+
+    >>> solutions = [SOLUTIONS[1, "1"], SOLUTIONS[1, "2"], SOLUTIONS[2, "1"]]
+    >>> durations = {"d1.part1": 0.5, "d1.part2": 2.0}
+    >>> [s.key for s in longest_first(solutions, durations)]
+    [(2, '1'), (1, '2'), (1, '1')]
+    """
+    return sorted(
+        solutions,
+        key=lambda s: durations.get(f"d{s.day}.part{s.part}", math.inf),
+        reverse=True,
+    )
+
+
+def run_all(
+    solutions: Iterable[Solution],
+    jobs: int | None = None,
+    source: loader.Source | None = None,
+    memory: bool = True,
+    timeout: float | None = None,
+    durations: Path = DURATIONS,
+    results: cache.Cache | None = None,
+) -> Iterator[Report]:
+    """Run `solutions` in a process pool, yielding reports as they finish."""
+    scheduled = longest_first(solutions, load_durations(durations))
+    reports = []
+    # NOTE: Workers would each read stdin of their own, so it is read here.
+    with _shared(source) as shared, ProcessPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(_run_task, s.key, shared, memory, timeout, results)
+            for s in scheduled
+        ]
+        for future in as_completed(futures):
+            report = future.result()
+            reports.append(report)
+            yield report
+
+    save_durations(durations, reports)
+
+
+def days(spec: str) -> list[int]:
+    """Days in a comma separated list of days or inclusive ranges.
+
+    >>> days("1-3,7")
+    [1, 2, 3, 7]
+    >>> days("all") == list(range(1, 26))
+    True
+    """
+    if spec == "all":
+        return list(range(1, 26))
+
+    selected = []
+    for item in spec.split(","):
+        first, _, last = item.partition("-")
+        selected.extend(range(int(first), int(last or first) + 1))
+    return selected
+
+
+def select(days: list[int], part: str | None = None) -> list[Solution]:
+    """Solutions of `days` in order, all parts unless `part` is given."""
+    return [
+        solution
+        for day in days
+        for (d, p), solution in SOLUTIONS.items()
+        if d == day and (part is None or p == part)
+    ]
+
+
+def format_report(report: Report) -> str:
+    """
+    >>> report = Report(1, "1", 7, {"solve": Phase(0.5, 2 * 1024 * 1024)})
+    >>> print(format_report(report))
+    d1.part1: 7
+        solve     0.5000s       2.0MB
+        total     0.5000s
+    """
+    answer = str(report.answer).rstrip()
+    separator = "\n" if "\n" in answer else " "
+    lines = [f"{report.name}:{separator}{answer}"]
+    for name, phase in report.phases.items():
+        line = f"    {name:<6} {phase.seconds:9.4f}s"
+        if phase.peak_bytes is not None:
+            line += f" {phase.peak_bytes / 1024 / 1024:9.1f}MB"
+        lines.append(line)
+    lines.append(f"    {'total':<6} {report.seconds:9.4f}s")
+    return "\n".join(lines)
+
+
+def format_table(reports: Iterable[Report]) -> str:
+    """
+    >>> reports = [
+    ...     Report(1, "1", 7, {"solve": Phase(0.5, 2 * 1024 * 1024)}),
+    ...     Report(1, "2", status="timeout", phases={"total": Phase(10.0)}),
+    ... ]
+    >>> print(format_table(reports))
+    solution          status   answer                 seconds    peak
+    d1.part1          ok       7                       0.5000   2.0MB
+    d1.part2          timeout                         10.0000       -
+    """
+    lines = [
+        f"{'solution':<17} {'status':<8} {'answer':<20} {'seconds':>9} {'peak':>7}"
+    ]
+    for report in sorted(reports, key=lambda r: (r.day, r.part)):
+        answer = "" if report.answer is None else str(report.answer).strip()
+        if "\n" in answer or len(answer) > 20:
+            answer = answer.splitlines()[0][:19] + "…"
+        peaks = [p.peak_bytes for p in report.phases.values() if p.peak_bytes]
+        peak = f"{max(peaks) / 1024 / 1024:5.1f}MB" if peaks else "-"
+        lines.append(
+            f"{report.name:<17} {report.label:<8} {answer:<20}"
+            f" {report.seconds:9.4f} {peak:>7}"
+        )
+    return "\n".join(lines)
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("days", type=days, help="e.g. 5, 1-5, 1,3 or all")
+    parser.add_argument("part", nargs="?", help="default every part")
+    parser.add_argument("--input", help="input file or - for stdin")
+    parser.add_argument(
+        "--no-memory", dest="memory", action="store_false", help="skip tracemalloc"
+    )
+    parser.add_argument("--jobs", type=int, help="run in a pool of this many processes")
+    parser.add_argument("--timeout", type=float, help="per solution, with --jobs")
+    parser.add_argument("--durations", type=Path, default=DURATIONS)
+    parser.add_argument(
+        "--no-cache", dest="cache", action="store_false", help="always solve"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=cache.MAX_BYTES, help="in bytes"
+    )
+    parser.set_defaults(main=main)
+
+
+def main(args: argparse.Namespace) -> int:
+    solutions = select(args.days, args.part)
+    if not solutions:
+        print("no matching solutions")
+        return 1
+
+    results = cache.Cache(max_bytes=args.cache_size) if args.cache else None
+    if args.jobs is None:
+        with _shared(args.input) as source:
+            for solution in solutions:
+                report = run(solution, source, args.memory, results)
+                print(format_report(report), flush=True)
+        return 0
+
+    reports = []
+    for report in run_all(
+        solutions,
+        args.jobs,
+        args.input,
+        args.memory,
+        args.timeout,
+        args.durations,
+        results,
+    ):
+        print(f"{report.name:<17} {report.label:<8} {report.seconds:9.4f}s", flush=True)
+        if report.status == "error":
+            print(report.output, flush=True)
+        reports.append(report)
+
+    print()
+    print(format_table(reports))
+    return 0 if all(r.status == "ok" for r in reports) else 1
@@ -0,0 +1,277 @@
+"""Registry of every solution split into read, parse and solve stages.
+
+Each stage mirrors what the `__main__` block of the solution does, calling
+the same functions where the part module has them, so the solutions can be
+driven (and timed) without running them as scripts.
+
+>>> solution = SOLUTIONS[5, "2"]
+>>> solution.module
+'d5.part2'
+>>> solution.path.relative_to(ROOT).as_posix()
+'d5/part2.py'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import math
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Final, TypeAlias
+
+from advent2021 import loader
+
+ROOT: Final[Path] = Path(__file__).resolve().parent.parent
+
+Key: TypeAlias = tuple[int, str]
+Read: TypeAlias = Callable[[ModuleType, loader.Source], Any]
+Stage: TypeAlias = Callable[[ModuleType, Any], Any]
+
+
+def _identity(_: ModuleType, data: Any) -> Any:
+    return data
+
+
+def _lines(module: ModuleType, source: loader.Source) -> list:
+    return list(module.read(source))
+
+
+def _parse(module: ModuleType, lines: list) -> Any:
+    return module.parse(lines)
+
+
+def _solve(module: ModuleType, data: Any) -> Any:
+    return module.solve(data)
+
+
+def _d8_total(_: ModuleType, lines: list[str]) -> int:
+    # NOTE: Imported when called, like the part modules `Solution.load` only
+    # imports when a solution runs.
+    from d8.signature import total_lines
+
+    return total_lines(lines)
+
+
+@dataclass(frozen=True)
+class Solution:
+    day: int
+    part: str
+    solve: Stage
+    read: Read = _lines
+    parse: Stage = _identity
+
+    @property
+    def key(self) -> Key:
+        return self.day, self.part
+
+    @property
+    def module(self) -> str:
+        return f"d{self.day}.part{self.part}"
+
+    @property
+    def path(self) -> Path:
+        return ROOT / f"d{self.day}" / f"part{self.part}.py"
+
+    @property
+    def input(self) -> Path:
+        return ROOT / f"d{self.day}" / "input.txt"
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(self.module)
+
+    def run(
+        self,
+        module: ModuleType | None = None,
+        source: loader.Source | None = None,
+    ) -> Any:
+        """Run all the stages one after another."""
+        module = self.load() if module is None else module
+        source = self.input if source is None else source
+        data = self.parse(module, self.read(module, source))
+        return self.solve(module, data)
+
+
+SOLUTIONS: Final[dict[Key, Solution]] = {
+    s.key: s
+    for s in [
+        Solution(1, "1", solve=lambda m, d: m.get_increases(d)),
+        Solution(
+            1,
+            "2",
+            solve=lambda m, d: m.count_increases(d, window=3),
+        ),
+        Solution(
+            2,
+            "1",
+            parse=lambda m, d: [m.parse_instruction(i) for i in d],
+            solve=lambda m, d: math.prod(m.evaluate(d)),
+        ),
+        Solution(
+            2,
+            "2",
+            parse=lambda m, d: [m.parse_instruction(i) for i in d],
+            solve=lambda m, d: math.prod(m.evaluate(d)),
+        ),
+        Solution(
+            3,
+            "1",
+            read=lambda m, s: m.Report.read(s),
+            solve=lambda m, d: m.power_consumption(d),
+        ),
+        Solution(
+            3,
+            "2",
+            read=lambda m, s: m.Report.read(s),
+            solve=lambda m, d: m.life_support_rating(d),
+        ),
+        Solution(
+            4,
+            "1",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.first_and_last(*d)[0].score,
+        ),
+        Solution(
+            4,
+            "2",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.first_and_last(*d)[1].score,
+        ),
+        Solution(
+            5,
+            "1",
+            parse=lambda m, d: m.segments(m.parse_coords(d), diagonals=False),
+            solve=lambda m, d: m.count_overlaps(d),
+        ),
+        Solution(
+            5,
+            "2",
+            parse=lambda m, d: m.segments(m.parse_lines(d), diagonals=True),
+            solve=lambda m, d: m.count_overlaps(d),
+        ),
+        Solution(6, "1", solve=lambda m, d: m.Population().total(d, 80)),
+        Solution(6, "2", solve=lambda m, d: m.Population().total(d, 256)),
+        Solution(7, "1", solve=lambda m, d: m.best_linear(d)),
+        Solution(7, "2", solve=lambda m, d: m.best_triangular(d)),
+        Solution(8, "1", solve=lambda m, d: m.count_digits(d)),
+        Solution(8, "2", solve=_d8_total),
+        Solution(8, "2csp", solve=lambda m, d: asyncio.run(m.asum(m.decode(d)))),
+        Solution(
+            9,
+            "1",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: sum(height + 1 for height in m.get_low_points(d)),
+        ),
+        Solution(
+            9,
+            "2",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.product(sorted(m.get_basin_sizes(d))[-3:]),
+        ),
+        Solution(10, "1", solve=lambda m, d: sum(m.get_scores(d))),
+        Solution(10, "2", solve=lambda m, d: statistics.median(m.get_scores(d))),
+        Solution(
+            11,
+            "1",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.count_flashes(d),
+        ),
+        Solution(
+            11,
+            "2",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.synchronised_step(d),
+        ),
+        Solution(
+            12,
+            "1",
+            parse=lambda m, d: m.get_adjacency(d),
+            solve=lambda m, d: m.count_paths(d),
+        ),
+        Solution(
+            12,
+            "2",
+            parse=lambda m, d: m.get_adjacency(d),
+            solve=lambda m, d: m.count_paths(d),
+        ),
+        Solution(13, "1", parse=_parse, solve=_solve),
+        Solution(13, "2", parse=_parse, solve=_solve),
+        Solution(14, "1", parse=_parse, solve=_solve),
+        Solution(14, "2", parse=_parse, solve=_solve),
+        Solution(15, "1", read=lambda m, s: m.read(s), solve=_solve),
+        Solution(
+            15,
+            "2",
+            read=lambda m, s: m.read(s),
+            parse=lambda m, d: m.TiledMap(d),
+            solve=lambda m, d: m.lowest_risk(d),
+        ),
+        Solution(
+            16,
+            "1",
+            read=lambda m, s: m.read(s),
+            parse=lambda m, d: m.parse(m.get_bits(d)),
+            solve=lambda m, d: sum(d.versions()),
+        ),
+        Solution(
+            16,
+            "2",
+            read=lambda m, s: m.read(s),
+            parse=lambda m, d: m.parse(m.get_bits(d)),
+            solve=lambda m, d: m.evaluate(d),
+        ),
+        Solution(
+            17,
+            "1",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: m.apogee(-d[1][0] - 1),
+        ),
+        Solution(
+            17,
+            "2",
+            read=lambda m, s: m.read(s),
+            solve=lambda m, d: len(set(m.solve(*d))),
+        ),
+        Solution(18, "1", parse=lambda m, d: list(m.parse(d)), solve=_solve),
+        Solution(18, "2", solve=_solve),
+        Solution(19, "1", parse=lambda m, d: list(m.parse_scanners(d)), solve=_solve),
+        Solution(19, "2", parse=lambda m, d: list(m.parse_scanners(d)), solve=_solve),
+        Solution(20, "1", parse=lambda m, d: m.load(iter(d)), solve=_solve),
+        Solution(20, "2", parse=lambda m, d: m.load(iter(d)), solve=_solve),
+        Solution(21, "1", solve=lambda m, d: m.play(d)),
+        Solution(
+            21,
+            "2",
+            solve=lambda m, d: max(m.traverse(m.GameState(tuple(d))).values()),
+        ),
+        Solution(22, "1", parse=lambda m, d: list(m.bound(m.load(d))), solve=_solve),
+        Solution(
+            22,
+            "2",
+            parse=lambda m, d: list(m.load_cubes(m.load(d))),
+            solve=lambda m, d: m.total(m.reactor_reboot(iter(d))),
+        ),
+        Solution(23, "1", parse=lambda m, d: m.load(iter(d)), solve=_solve),
+        Solution(
+            23,
+            "2",
+            parse=lambda m, d: m.load(iter(d), room_size=4),
+            solve=_solve,
+        ),
+        Solution(24, "1", parse=lambda m, d: list(m.load(d)), solve=_solve),
+        Solution(
+            24,
+            "2",
+            read=lambda m, s: None,
+            solve=lambda m, _: m.first(m.values()),
+        ),
+        Solution(
+            25,
+            "1",
+            parse=lambda m, d: m.load(d),
+            solve=lambda m, d: m.ilen(m.move(d)) + 1,
+        ),
+    ]
+}
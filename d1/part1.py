@@ -1,10 +1,11 @@
 from typing import Iterator
 
+from advent2021 import loader
 
-def read() -> Iterator[int]:
-    with open("d1/input.txt") as f:
-        for line in f:
-            yield int(line.strip())
+
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[int]:
+    for line in loader.lines(source):
+        yield int(line)
 
 
 def get_increases(distances: Iterator[int]):
@@ -20,4 +21,4 @@ def get_increases(distances: Iterator[int]):
 
 
 if __name__ == "__main__":
-    print(get_increases(read()))
+    print(get_increases(read(loader.from_argv(__file__))))
@@ -0,0 +1,96 @@
+"""Count increases of sliding window sums, for any window size.
+
+Consecutive windows of `k` readings share all but their first and last
+reading, so the sum of window `i + 1` is larger than the sum of window `i`
+exactly when reading `i + k` is larger than reading `i`. Nothing needs
+summing, each reading is compared with the one `k` before it.
+
+With numpy the comparison is done a chunk of readings at a time, over text or
+over a binary `.npy` file which is memory-mapped rather than loaded:
+
+    $ python -m d1.window depths.txt --window 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import itertools
+import time
+from typing import Final, Iterable, Iterator
+
+from advent2021 import loader
+from advent2021.optional import numpy
+
+CHUNK_SIZE: Final[int] = 1 << 24
+
+
+def count_increases(depths: Iterable[int], window: int = 1) -> int:
+    """
+    >>> depths = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+    >>> count_increases(depths), count_increases(depths, window=3)
+    (7, 5)
+    """
+    depths = iter(depths)
+    previous = collections.deque(itertools.islice(depths, window), maxlen=window)
+    total = 0
+    for depth in depths:
+        total += depth > previous[0]
+        previous.append(depth)
+
+    return total
+
+
+def count_increases_chunked(chunks: Iterable[numpy.ndarray], window: int = 1) -> int:
+    """Increases over consecutive arrays of readings.
+
+    The last `window` readings of each chunk are carried over to the next.
+
+    >>> chunks = [numpy.array([199, 200, 208]), numpy.array([210, 200, 207])]
+    >>> count_increases_chunked(chunks, window=3)
+    1
+    """
+    total = 0
+    carried = numpy.empty(0, numpy.int64)
+    for chunk in chunks:
+        depths = numpy.concatenate([carried, chunk])
+        total += int(numpy.count_nonzero(depths[window:] > depths[:-window]))
+        carried = depths[-window:]
+
+    return total
+
+
+def text_chunks(source: loader.Source) -> Iterator[numpy.ndarray]:
+    """Readings of a text `source`, one array per chunk of lines."""
+    for chunk in loader.line_chunks(source, CHUNK_SIZE):
+        yield numpy.fromstring(chunk, dtype=numpy.int64, sep="\n")
+
+
+def binary_chunks(path: str) -> Iterator[numpy.ndarray]:
+    """Readings of a `.npy` file, paged in from disk a chunk at a time."""
+    depths = numpy.load(path, mmap_mode="r")
+    step = CHUNK_SIZE // depths.itemsize
+    for start in range(0, len(depths), step):
+        yield numpy.asarray(depths[start : start + step], numpy.int64)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m d1.window")
+    parser.add_argument("source", nargs="?", default=loader.default(__file__))
+    parser.add_argument("--window", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if numpy is None:
+        total = count_increases(map(int, loader.lines(args.source)), args.window)
+    elif str(args.source).endswith(".npy"):
+        total = count_increases_chunked(binary_chunks(args.source), args.window)
+    else:
+        total = count_increases_chunked(text_chunks(args.source), args.window)
+
+    print(total)
+    print(f"counted in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from typing import Final, Iterable, Iterator
 
+from advent2021 import loader
+
 
 CLOSER: Final[dict[str, str]] = {
     "{": "}",
@@ -17,10 +19,8 @@ SCORES: Final[dict[str, int]] = {
 }
 
 
-def read() -> Iterator[str]:
-    with open("d10/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def check(line: str) -> str | None:
@@ -57,4 +57,4 @@ def get_scores(lines: Iterable[str]) -> Iterator[int]:
 
 
 if __name__ == "__main__":
-    print(sum(get_scores(read())))
+    print(sum(get_scores(read(loader.from_argv(__file__)))))
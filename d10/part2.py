@@ -1,6 +1,8 @@
 from statistics import median
 from typing import Final, Iterable, Iterator
 
+from advent2021 import loader
+
 
 CLOSER: Final[dict[str, str]] = {
     "{": "}",
@@ -18,10 +20,8 @@ SCORES: Final[dict[str, int]] = {
 }
 
 
-def read() -> Iterator[str]:
-    with open("d10/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def complete(line: str) -> str | None:
@@ -71,4 +71,4 @@ def get_scores(lines: Iterable[str]) -> Iterator[int]:
 
 
 if __name__ == "__main__":
-    print(median(get_scores(read())))
+    print(median(get_scores(read(loader.from_argv(__file__)))))
@@ -0,0 +1,193 @@
+"""Count paths through the caves without building them.
+
+Where a path can go next only depends on the cave it is in, the small caves
+it has already been through and whether it has already been through one of
+them twice. Caves are numbered so the small caves visited fit in an int
+bitmask, and the number of ways to reach the end from each of these states is
+memoised, so counting takes time in the number of states, not paths.
+
+Before counting, the big caves are contracted away. A path only ever passes
+through a big cave from one small cave to another, so each big cave becomes
+weighted edges between its small neighbours: the weight of an edge is the
+number of ways of making that move, directly or through any big cave.
+"""
+
+from __future__ import annotations
+
+import array
+import collections
+import functools
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+START, END = "start", "end"
+
+
+State = tuple[int, int, bool]
+
+
+@dataclass(frozen=True)
+class Caves:
+    """Caves numbered by name, with the small ones as a bitmask.
+
+    The neighbours of each cave are an array of ids, with a parallel array of
+    the number of ways of moving to each of them.
+    """
+
+    names: tuple[str, ...]
+    neighbours: tuple[array.array, ...]
+    weights: tuple[array.array, ...]
+    small: int
+    start: int
+    end: int
+
+    @classmethod
+    def from_adjacency(cls, adjacency: dict[str, set[str]]) -> Caves:
+        names = tuple(sorted(adjacency))
+        ids = {name: i for i, name in enumerate(names)}
+        neighbours = tuple(
+            array.array("I", sorted(ids[cave] for cave in adjacency[name]))
+            for name in names
+        )
+        return cls(
+            names=names,
+            neighbours=neighbours,
+            weights=tuple(array.array("I", [1]) * len(n) for n in neighbours),
+            small=sum(1 << i for i, name in enumerate(names) if name.islower()),
+            start=ids[START],
+            end=ids[END],
+        )
+
+    def contracted(self) -> Caves:
+        """The same caves with every move through a big cave folded into the
+        weights of the moves between small caves.
+
+        >>> caves = Caves.from_adjacency(
+        ...     {"start": {"B", "C", "end"}, "B": {"start", "end"},
+        ...      "C": {"start", "end"}, "end": {"start", "B", "C"}}
+        ... ).contracted()
+        >>> [(caves.names[n], w) for n, w in caves._edges(caves.start)]
+        [('end', 3), ('start', 2)]
+        """
+        ways: list[collections.Counter[int]] = [
+            collections.Counter() for _ in self.names
+        ]
+        for cave in range(len(self.names)):
+            if not self.small >> cave & 1:
+                continue
+
+            for neighbour, weight in self._edges(cave):
+                if self.small >> neighbour & 1:
+                    ways[cave][neighbour] += weight
+                    continue
+
+                for onward, onward_weight in self._edges(neighbour):
+                    if not self.small >> onward & 1:
+                        raise ValueError(
+                            f"big caves {self.names[neighbour]} and "
+                            f"{self.names[onward]} are connected, there are "
+                            "infinitely many paths"
+                        )
+                    ways[cave][onward] += weight * onward_weight
+
+        return Caves(
+            names=self.names,
+            neighbours=tuple(array.array("I", sorted(w)) for w in ways),
+            weights=tuple(array.array("I", [w[n] for n in sorted(w)]) for w in ways),
+            small=self.small,
+            start=self.start,
+            end=self.end,
+        )
+
+    def _edges(self, cave: int) -> Iterator[tuple[int, int]]:
+        return zip(self.neighbours[cave], self.weights[cave])
+
+    def initial(self, twice: bool) -> State:
+        return self.start, 1 << self.start, twice
+
+    def moves(
+        self, cave: int, visited: int, spare: bool
+    ) -> Iterator[tuple[int, State]]:
+        """Ways of moving from `cave` and the states after, given the small
+        caves visited so far and whether one of them may still be visited
+        again."""
+        for neighbour, weight in self._edges(cave):
+            bit = 1 << neighbour
+            if not self.small & bit:
+                yield weight, (neighbour, visited, spare)
+            elif not visited & bit:
+                yield weight, (neighbour, visited | bit, spare)
+            elif spare and neighbour != self.start:
+                yield weight, (neighbour, visited, False)
+
+
+def _counter(caves: Caves) -> Callable[[int, int, bool], int]:
+    """Memoised number of paths to the end from a state."""
+
+    # NOTE: Caves.moves inlined, this runs once per state.
+    edges = [tuple(zip(n, w)) for n, w in zip(caves.neighbours, caves.weights)]
+    small, start, end = caves.small, caves.start, caves.end
+
+    @functools.cache
+    def count(cave: int, visited: int, spare: bool) -> int:
+        if cave == end:
+            return 1
+
+        total = 0
+        for neighbour, weight in edges[cave]:
+            bit = 1 << neighbour
+            if not small & bit:
+                total += weight * count(neighbour, visited, spare)
+            elif not visited & bit:
+                total += weight * count(neighbour, visited | bit, spare)
+            elif spare and neighbour != start:
+                total += weight * count(neighbour, visited, False)
+        return total
+
+    return count
+
+
+def count(caves: Caves, twice: bool = False) -> int:
+    """Number of paths from start to end, with `twice` one small cave may be
+    visited twice.
+
+    >>> caves = Caves.from_adjacency(
+    ...     {"start": {"A", "b"}, "A": {"start", "b", "c", "end"},
+    ...      "b": {"start", "A", "d", "end"}, "c": {"A"}, "d": {"b"},
+    ...      "end": {"A", "b"}}
+    ... )
+    >>> count(caves), count(caves, twice=True)
+    (10, 36)
+    """
+    return _counter(caves.contracted())(*caves.initial(twice))
+
+
+def paths(caves: Caves, twice: bool = False) -> Iterator[tuple[str, ...]]:
+    """Every path from start to end, lazily.
+
+    Moves with no way left to the end are skipped using the counts, so every
+    step taken leads to a path.
+
+    >>> caves = Caves.from_adjacency(
+    ...     {"start": {"A", "b"}, "A": {"start", "b", "end"},
+    ...      "b": {"start", "A"}, "end": {"A"}}
+    ... )
+    >>> sorted("-".join(path) for path in paths(caves))
+    ['start-A-b-A-end', 'start-A-end', 'start-b-A-end']
+    """
+    counter = _counter(caves)
+    route = [caves.start]
+
+    def walk(state: State) -> Iterator[tuple[str, ...]]:
+        if state[0] == caves.end:
+            yield tuple(caves.names[c] for c in route)
+            return
+
+        for _, move in caves.moves(*state):
+            if counter(*move):
+                route.append(move[0])
+                yield from walk(move)
+                route.pop()
+
+    if counter(*caves.initial(twice)):
+        yield from walk(caves.initial(twice))
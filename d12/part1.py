@@ -1,14 +1,13 @@
-from typing import Iterable, Iterator, cast
+from typing import Iterable, Iterator
 
-import parse
+from advent2021 import lineparse, loader
+from d12 import caves
 
-LINE_FORMAT = parse.compile("{:w}-{:w}")
+LINE_FORMAT = lineparse.compile("{:w}-{:w}")
 
 
-def read() -> Iterator[str]:
-    with open("d12/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_edge(line: str) -> tuple[str, str]:
@@ -16,8 +15,8 @@ def parse_edge(line: str) -> tuple[str, str]:
     >>> parse_edge("abcd-A")
     ('abcd', 'A')
     """
-    result = cast(parse.Result, LINE_FORMAT.parse(line))
-    return result[0], result[1]
+    start, end = LINE_FORMAT.fields(line)
+    return start, end
 
 
 def get_adjacency(lines: Iterable[str]) -> dict[str, set[str]]:
@@ -30,32 +29,9 @@ def get_adjacency(lines: Iterable[str]) -> dict[str, set[str]]:
     return matrix
 
 
-def find_paths(
-    adjacency: dict[str, set[str]],
-    collapsed: set[str] | None = None,
-    start: str = "start",
-) -> Iterator[list[str]]:
-    if collapsed is None:
-        collapsed = set()
-
-    if start in collapsed:
-        return
-
-    if start.islower():
-        collapsed = collapsed | {start}
-
-    if start == "end":
-        yield ["end"]
-        return
-
-    for cave in adjacency[start]:
-        for path in find_paths(adjacency, collapsed, cave):
-            yield [start] + path
-
-
-def ilen(it: Iterable) -> int:
-    return sum(1 for _ in it)
+def count_paths(adjacency: dict[str, set[str]]) -> int:
+    return caves.count(caves.Caves.from_adjacency(adjacency))
 
 
 if __name__ == "__main__":
-    print(ilen(find_paths(get_adjacency(read()))))
+    print(count_paths(get_adjacency(read(loader.from_argv(__file__)))))
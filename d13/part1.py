@@ -1,17 +1,15 @@
-from typing import Iterable, Iterator, Literal, TypeAlias, cast
+from typing import Iterable, Iterator, Literal, TypeAlias
 
-import parse
+from advent2021 import lineparse, loader
 
-COORD_FORMAT = parse.compile("{:d},{:d}")
-FOLD_FORMAT = parse.compile("fold along {axis:l}={value:d}")
+COORD_FORMAT = lineparse.compile("{:d},{:d}")
+FOLD_FORMAT = lineparse.compile("fold along {axis:l}={value:d}")
 Fold: TypeAlias = tuple[Literal["x", "y"], int]
 Coord: TypeAlias = tuple[int, int]
 
 
-def read() -> Iterator[str]:
-    with open("d13/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_coords(lines: Iterable[str]) -> Iterator[Coord]:
@@ -19,14 +17,20 @@ def parse_coords(lines: Iterable[str]) -> Iterator[Coord]:
         if not line:
             return
 
-        result = cast(parse.Result, COORD_FORMAT.parse(line))
-        yield result[0], result[1]
+        x, y = COORD_FORMAT.fields(line)
+        yield x, y
 
 
 def parse_folds(lines: Iterable[str]) -> Iterator[Fold]:
     for line in lines:
-        result = cast(parse.Result, FOLD_FORMAT.parse(line))
-        yield result['axis'], result['value']
+        axis, value = FOLD_FORMAT.fields(line)
+        yield axis, value
+
+
+def parse(lines: Iterable[str]) -> tuple[list[Coord], list[Fold]]:
+    lines = iter(lines)
+    coords = list(parse_coords(lines))
+    return coords, list(parse_folds(lines))
 
 
 def do_fold(coords: Iterable[Coord], fold: Fold) -> Iterator[Coord]:
@@ -42,9 +46,14 @@ def do_fold(coords: Iterable[Coord], fold: Fold) -> Iterator[Coord]:
                 yield coord
 
 
-if __name__ == "__main__":
-    lines = read()
-    coords = list(parse_coords(lines))
-    folds = list(parse_folds(lines))
+def solve(instructions: tuple[list[Coord], list[Fold]]) -> int:
+    """
+    >>> solve(parse(["0,0", "4,0", "", "fold along x=2"]))
+    1
+    """
+    coords, folds = instructions
+    return len(set(do_fold(coords, folds[0])))
+
 
-    print(len(set(do_fold(coords, folds[0]))))
+if __name__ == "__main__":
+    print(solve(parse(read(loader.from_argv(__file__)))))
@@ -1,14 +1,12 @@
-from typing import Iterable, Iterator, cast
+from typing import Iterable, Iterator
 
-import parse
+from advent2021 import lineparse, loader
 
-RULE_FORMAT = parse.compile("{:w} -> {:w}")
+RULE_FORMAT = lineparse.compile("{:w} -> {:w}")
 
 
-def read() -> Iterator[str]:
-    with open("d14/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_template(lines: Iterator[str]) -> str:
@@ -19,8 +17,14 @@ def parse_template(lines: Iterator[str]) -> str:
 
 def parse_rules(lines: Iterator[str]) -> Iterable[tuple[str, str]]:
     for line in lines:
-        result = cast(parse.Result, RULE_FORMAT.parse(line))
-        yield result[0], result[1]
+        pair, insert = RULE_FORMAT.fields(line)
+        yield pair, insert
+
+
+def parse(lines: Iterable[str]) -> tuple[str, dict[str, str]]:
+    lines = iter(lines)
+    template = parse_template(lines)
+    return template, dict(parse_rules(lines))
 
 
 def _step(polymer: str, rules: dict[str, str]) -> Iterator[str]:
@@ -49,12 +53,16 @@ def amplitude(element_count: dict[str, int]) -> int:
     return max(element_count.values()) - min(element_count.values())
 
 
-if __name__ == "__main__":
-    lines = read()
-    polymer = parse_template(lines)
-    rules = dict(parse_rules(lines))
-
-    for _ in range(10):
+def solve(instructions: tuple[str, dict[str, str]], steps: int = 10) -> int:
+    """
+    >>> solve(parse(["NN", "", "NN -> C", "NC -> B", "CN -> C"]), steps=1)
+    1
+    """
+    polymer, rules = instructions
+    for _ in range(steps):
         polymer = step(polymer, rules)
+    return amplitude(count(polymer))
+
 
-    print(amplitude(count(polymer)))
+if __name__ == "__main__":
+    print(solve(parse(read(loader.from_argv(__file__)))))
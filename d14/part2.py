@@ -1,19 +1,17 @@
 from collections import Counter
-from typing import Iterable, Iterator, TypeAlias, cast
+from typing import Iterable, Iterator, TypeAlias
 
-import parse
+from advent2021 import lineparse, loader
 
-RULE_FORMAT = parse.compile("{:w} -> {:w}")
+RULE_FORMAT = lineparse.compile("{:w} -> {:w}")
 
 Pair: TypeAlias = str
 NewPairs: TypeAlias = set[Pair]
 Element: TypeAlias = str
 
 
-def read() -> Iterator[str]:
-    with open("d14/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_template(lines: Iterator[str]) -> str:
@@ -24,8 +22,14 @@ def parse_template(lines: Iterator[str]) -> str:
 
 def parse_rules(lines: Iterator[str]) -> Iterable[tuple[Pair, NewPairs]]:
     for line in lines:
-        result = cast(parse.Result, RULE_FORMAT.parse(line))
-        yield result[0], {result[0][0] + result[1], result[1] + result[0][1]}
+        pair, insert = RULE_FORMAT.fields(line)
+        yield pair, {pair[0] + insert, insert + pair[1]}
+
+
+def parse(lines: Iterable[str]) -> tuple[str, dict[Pair, NewPairs]]:
+    lines = iter(lines)
+    template = parse_template(lines)
+    return template, dict(parse_rules(lines))
 
 
 def get_pair_count(template: str) -> Counter[Pair]:
@@ -49,8 +53,9 @@ def count(pairs: Counter[Pair], start: Element, end: Element) -> Counter[Element
     counter[start] += 1
     counter[end] += 1
 
+    # NOTE: Every element is in two pairs, but the ends counted once more.
     for element in counter:
-        element //= 2
+        counter[element] //= 2
 
     return counter
 
@@ -59,13 +64,17 @@ def amplitude(count: Counter[Element]) -> int:
     return max(count.values()) - min(count.values())
 
 
-if __name__ == "__main__":
-    lines = read()
-    polymer = parse_template(lines)
-    rules = dict(parse_rules(lines))
+def solve(instructions: tuple[str, dict[Pair, NewPairs]], steps: int = 40) -> int:
+    """
+    >>> solve(parse(["NN", "", "NN -> C", "NC -> B", "CN -> C"]), steps=2)
+    1
+    """
+    polymer, rules = instructions
     pair_count = get_pair_count(polymer)
-
-    for _ in range(40):
+    for _ in range(steps):
         pair_count = step(pair_count, rules)
+    return amplitude(count(pair_count, start=polymer[0], end=polymer[-1]))
+
 
-    print(amplitude(count(pair_count, start=polymer[0], end=polymer[-1])))
+if __name__ == "__main__":
+    print(solve(parse(read(loader.from_argv(__file__)))))
@@ -3,36 +3,16 @@
 This happens to work, for full solution see part2.
 """
 
-from dataclasses import dataclass
-from typing import Generic, Iterator, TypeAlias, TypeVar, cast
+from typing import Iterator, TypeAlias
 
-Position: TypeAlias = tuple[int, int]
-
-T = TypeVar("T")
-
-
-@dataclass
-class Grid(Generic[T]):
-    grid: list[list[T]]
-
-    @property
-    def width(self) -> int:
-        return len(self.grid[0])
-
-    @property
-    def height(self) -> int:
-        return len(self.grid)
+from advent2021 import loader
+from advent2021.grid import Grid
 
-    def __getitem__(self, position: Position) -> T:
-        return self.grid[position[0]][position[1]]
-
-    def __setitem__(self, position: Position, value: T) -> None:
-        self.grid[position[0]][position[1]] = value
+Position: TypeAlias = tuple[int, int]
 
 
-def read() -> list[list[int]]:
-    with open("d15/input.txt") as f:
-        return [[int(c) for c in l.strip()] for l in f]
+def read(source: loader.Source = loader.default(__file__)) -> Grid:
+    return Grid.read(source)
 
 
 def predecessors(position: Position) -> Iterator[Position]:
@@ -43,21 +23,27 @@ def predecessors(position: Position) -> Iterator[Position]:
         yield row, col - 1
 
 
-def generate_scores(risks: Grid[int]) -> Grid[int]:
-
-    scores: Grid[int | None] = Grid([[None] * risks.width] * risks.height)
+def generate_scores(risks: Grid) -> Grid:
+    """
+    >>> generate_scores(Grid.parse("116\\n138\\n213"))
+    Grid([[0, 1, 7], [1, 4, 12], [3, 4, 7]])
+    """
+    scores = Grid.full(risks.height, risks.width, 0, typecode="q")
 
     for r in range(risks.height):
         for c in range(risks.width):
             risk = risks[r, c]
             scores[r, c] = min(
-                (cast(int, scores[p]) + risk for p in predecessors((r, c))),
+                (scores[p] + risk for p in predecessors((r, c))),
                 default=0,
             )
 
-    return cast(Grid[int], scores)
+    return scores
+
+
+def solve(risks: Grid) -> int:
+    return generate_scores(risks)[risks.height - 1, risks.width - 1]
 
 
 if __name__ == "__main__":
-    risks = Grid(read())
-    print(generate_scores(risks)[risks.height - 1, risks.width - 1])
+    print(solve(read(loader.from_argv(__file__))))
@@ -0,0 +1,258 @@
+"""Lowest risk paths with a bucket queue, over maps computed on demand.
+
+Every step costs a risk of 1 to 9, so the scores waiting in the queue never
+span more than a handful of values. Dial's algorithm keeps them in a ring of
+buckets indexed by score instead of a heap: pushing and popping are O(1) and
+the search is linear in the cells visited.
+
+With `estimate` the search is A*, ordered by score plus the Manhattan distance
+left to the end. Each step costs at least 1 and brings the end at most 1
+closer, so the estimate never overshoots and the first time the end is popped
+its score is the lowest.
+
+`TiledMap` computes the risks of the full map of part 2 from the base map when
+they are looked up, so an expanded map is never allocated.
+
+For many queries against one map, `PathFinder` keeps the `DistanceField` of
+the most recently used sources: the lowest risk from a source to every cell
+and the step that reached it, so each query is a lookup plus a walk back.
+"""
+
+from __future__ import annotations
+
+import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Final, Iterable, Protocol
+
+from advent2021.grid import ORTHOGONAL, Coord, Grid
+
+MAX_RISK: Final[int] = 9
+UNREACHED: Final[int] = -1
+# NOTE: Queued priorities span at most MAX_RISK + 1 as the A* estimate can
+# grow by one on top of a step's risk, so one more bucket than that is enough
+# for them never to share a bucket.
+BUCKETS: Final[int] = MAX_RISK + 2
+
+
+class RiskMap(Protocol):
+    height: int
+    width: int
+
+    def __getitem__(self, coord: Coord) -> int: ...
+
+
+class TiledMap:
+    """`base` repeated `tiles` times each way, risks going up by one per tile.
+
+    >>> tiled = TiledMap(Grid.parse("8"))
+    >>> [tiled[0, col] for col in range(tiled.width)]
+    [8, 9, 1, 2, 3]
+    >>> tiled[4, 4]
+    7
+    """
+
+    __slots__ = ("base", "tiles", "height", "width")
+
+    def __init__(self, base: Grid, tiles: int = 5) -> None:
+        self.base = base
+        self.tiles = tiles
+        self.height = base.height * tiles
+        self.width = base.width * tiles
+
+    def __getitem__(self, coord: Coord) -> int:
+        tile_row, row = divmod(coord[0], self.base.height)
+        tile_col, col = divmod(coord[1], self.base.width)
+        return (self.base[row, col] + tile_row + tile_col - 1) % MAX_RISK + 1
+
+
+def lowest_risk(
+    risks: RiskMap,
+    start: Coord = (0, 0),
+    end: Coord | None = None,
+    estimate: bool = True,
+) -> int:
+    """Lowest total risk of the cells entered going from `start` to `end`.
+
+    `end` defaults to the bottom right corner.
+
+    >>> risks = Grid.parse("1163751742\\n1381373672\\n2136511328\\n3694931569\\n"
+    ...     "7463417111\\n1319128137\\n1359912421\\n3125421639\\n1293138521\\n"
+    ...     "2311944581")
+    >>> lowest_risk(risks), lowest_risk(risks, estimate=False)
+    (40, 40)
+    >>> lowest_risk(TiledMap(risks))
+    315
+    >>> lowest_risk(risks, start=(9, 9), end=(0, 0))
+    40
+    """
+    height, width = risks.height, risks.width
+    end_row, end_col = end if end is not None else (height - 1, width - 1)
+
+    def priority(score: int, row: int, col: int) -> int:
+        if not estimate:
+            return score
+        return score + abs(end_row - row) + abs(end_col - col)
+
+    # NOTE: Flat `row * width + col` indices, so each cell costs 8 bytes here
+    # and nothing else until it is queued.
+    best = array.array("q", [UNREACHED]) * (height * width)
+    target = end_row * width + end_col
+    buckets: list[list[int]] = [[] for _ in range(BUCKETS)]
+    best[start[0] * width + start[1]] = 0
+    current = priority(0, *start)
+    buckets[current % BUCKETS].append(start[0] * width + start[1])
+    queued = 1
+
+    while queued:
+        bucket = buckets[current % BUCKETS]
+        # NOTE: Steps that keep the same priority land back in this bucket.
+        while bucket:
+            index = bucket.pop()
+            queued -= 1
+            row, col = divmod(index, width)
+            score = best[index]
+            # NOTE: Cells queued again with a lower score leave stale entries.
+            if priority(score, row, col) != current:
+                continue
+            if index == target:
+                return score
+
+            for dr, dc in ORTHOGONAL:
+                r, c = row + dr, col + dc
+                if not (0 <= r < height and 0 <= c < width):
+                    continue
+
+                new = score + risks[r, c]
+                previous = best[r * width + c]
+                if previous == UNREACHED or new < previous:
+                    best[r * width + c] = new
+                    buckets[priority(new, r, c) % BUCKETS].append(r * width + c)
+                    queued += 1
+
+        current += 1
+
+    raise ValueError(f"{end_row, end_col} can't be reached from {start}")
+
+
+@dataclass(frozen=True)
+class Route:
+    risk: int
+    path: list[Coord]
+
+
+class DistanceField:
+    """Lowest risk from `source` to every cell of `risks`.
+
+    Computed once, in time linear in the cells, with a ring of MAX_RISK + 1
+    buckets as nothing is queued more than MAX_RISK above the current score.
+
+    >>> field = DistanceField(Grid.parse("191\\n111"), (0, 0))
+    >>> field.risk((0, 2)), field.path((0, 2))
+    (4, [(0, 0), (1, 0), (1, 1), (1, 2), (0, 2)])
+    """
+
+    def __init__(self, risks: RiskMap, source: Coord) -> None:
+        self.risks = risks
+        self.source = source
+        height, width = risks.height, risks.width
+        self.scores = [UNREACHED] * (height * width)
+        # NOTE: Index into ORTHOGONAL plus one of the step into each cell.
+        self.steps = bytearray(height * width)
+
+        buckets: list[list[tuple[int, int]]] = [[] for _ in range(MAX_RISK + 1)]
+        self.scores[source[0] * width + source[1]] = 0
+        buckets[0].append(source)
+        queued, current = 1, 0
+        while queued:
+            bucket = buckets[current % len(buckets)]
+            while bucket:
+                row, col = bucket.pop()
+                queued -= 1
+                score = self.scores[row * width + col]
+                if score != current:
+                    continue
+
+                for step, (dr, dc) in enumerate(ORTHOGONAL, start=1):
+                    r, c = row + dr, col + dc
+                    if not (0 <= r < height and 0 <= c < width):
+                        continue
+
+                    new = score + risks[r, c]
+                    previous = self.scores[r * width + c]
+                    if previous == UNREACHED or new < previous:
+                        self.scores[r * width + c] = new
+                        self.steps[r * width + c] = step
+                        buckets[new % len(buckets)].append((r, c))
+                        queued += 1
+
+            current += 1
+
+    def risk(self, target: Coord) -> int:
+        return self.scores[target[0] * self.risks.width + target[1]]
+
+    def path(self, target: Coord) -> list[Coord]:
+        """Cells from the source to `target`, both included."""
+        path = [target]
+        row, col = target
+        while step := self.steps[row * self.risks.width + col]:
+            dr, dc = ORTHOGONAL[step - 1]
+            row, col = row - dr, col - dc
+            path.append((row, col))
+
+        path.reverse()
+        return path
+
+
+class PathFinder:
+    """Lowest risk routes between any cells of `risks`.
+
+    The distance fields of the `max_fields` most recently used sources are
+    kept. A query is answered from the field of either of its ends, as the
+    lowest risk path between two cells is the same both ways round.
+
+    >>> finder = PathFinder(Grid.parse("116\\n138\\n213"), max_fields=1)
+    >>> finder.route((0, 0), (2, 2))
+    Route(risk=7, path=[(0, 0), (1, 0), (2, 0), (2, 1), (2, 2)])
+    >>> finder.route((2, 2), (0, 0)).risk, finder.computed
+    (5, 1)
+    >>> [r.risk for r in finder.routes([((0, 2), (2, 0)), ((0, 0), (0, 2))])]
+    [5, 7]
+    """
+
+    def __init__(self, risks: RiskMap, max_fields: int = 8) -> None:
+        self.risks = risks
+        self.max_fields = max_fields
+        self.fields: OrderedDict[Coord, DistanceField] = OrderedDict()
+        self.computed = 0
+
+    def field(self, source: Coord) -> DistanceField:
+        if source in self.fields:
+            self.fields.move_to_end(source)
+            return self.fields[source]
+
+        field = self.fields[source] = DistanceField(self.risks, source)
+        self.computed += 1
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def route(self, start: Coord, end: Coord) -> Route:
+        if start not in self.fields and end in self.fields:
+            # NOTE: Walking the field of `end` back from `start` gives the path
+            # in order, the risks entered differ only by the two ends.
+            field = self.field(end)
+            path = field.path(start)
+            path.reverse()
+            risk = field.risk(start) - self.risks[start] + self.risks[end]
+            return Route(risk, path)
+
+        field = self.field(start)
+        return Route(field.risk(end), field.path(end))
+
+    def routes(self, queries: Iterable[tuple[Coord, Coord]]) -> list[Route]:
+        """Routes for every `(start, end)`, answered grouped by start."""
+        queries = list(queries)
+        order = sorted(range(len(queries)), key=lambda i: queries[i][0])
+        routes = {i: self.route(*queries[i]) for i in order}
+        return [routes[i] for i in range(len(queries))]
@@ -2,6 +2,8 @@ import itertools
 from dataclasses import dataclass
 from typing import Iterable, Iterator
 
+from advent2021 import loader
+
 
 @dataclass
 class Packet:
@@ -16,9 +18,8 @@ class Packet:
                 yield from packet.versions()
 
 
-def read() -> str:
-    with open("d16/input.txt") as f:
-        return f.read().strip()
+def read(source: loader.Source = loader.default(__file__)) -> str:
+    return loader.text(source).strip()
 
 
 def get_bits(hex: str) -> Iterator[str]:
@@ -116,6 +117,6 @@ def parse_until_limit(bits: Iterable[str], limit: int) -> Iterator[Packet]:
 
 
 if __name__ == "__main__":
-    packet = parse(get_bits(read()))
+    packet = parse(get_bits(read(loader.from_argv(__file__))))
     assert packet is not None
     print(sum(packet.versions()))
@@ -1,6 +1,7 @@
 from typing import Iterable
 
-from part1 import Packet, get_bits, parse, read
+from advent2021 import loader
+from d16.part1 import Packet, get_bits, parse, read
 
 
 
@@ -52,6 +53,6 @@ def evaluate(packet: Packet) -> int:
 
 
 if __name__ == "__main__":
-    packet = parse(get_bits(read()))
+    packet = parse(get_bits(read(loader.from_argv(__file__))))
     assert packet is not None
     print(evaluate(packet))
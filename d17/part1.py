@@ -1,12 +1,18 @@
 from typing import cast
 from parse import Result, parse
 
+from advent2021 import loader
 
-def read() -> tuple[tuple[int, int], tuple[int, int]]:
-    with open("d17/input.txt") as f:
-        result = parse("target area: x={x0:d}..{x1:d}, y={y0:d}..{y1:d}", f.read())
-        result = cast(Result, result)
-        return (result["x0"], result["x1"]), (result["y0"], result["y1"])
+
+def read(
+    source: loader.Source = loader.default(__file__),
+) -> tuple[tuple[int, int], tuple[int, int]]:
+    result = parse(
+        "target area: x={x0:d}..{x1:d}, y={y0:d}..{y1:d}",
+        loader.text(source).strip(),
+    )
+    result = cast(Result, result)
+    return (result["x0"], result["x1"]), (result["y0"], result["y1"])
 
 
 def apogee(initial: int) -> int:
@@ -37,7 +43,7 @@ def position(initial: int, steps: int) -> int:
 
 
 if __name__ == "__main__":
-    _, (y0, _) = read()
+    _, (y0, _) = read(loader.from_argv(__file__))
     # NOTE: At 0 height, the velocity is -initial - 1
     # Best toss is -(y0 + 1)
     print(apogee(-y0 - 1))
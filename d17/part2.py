@@ -2,7 +2,8 @@ import cmath
 import math
 from typing import Iterable, Iterator
 
-from part1 import read
+from advent2021 import loader
+from d17.part1 import read
 
 
 def solve_quadratic(a: int, b: int, c: int) -> Iterable[complex]:
@@ -83,4 +84,4 @@ def ilen(iterable: Iterable) -> int:
 
 
 if __name__ == "__main__":
-    print(len(set(solve(*read()))))
+    print(len(set(solve(*read(loader.from_argv(__file__))))))
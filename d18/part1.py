@@ -4,6 +4,8 @@ import ast
 from dataclasses import dataclass
 from typing import Iterable, Iterator, cast
 
+from advent2021 import loader
+
 
 @dataclass
 class Node:
@@ -215,10 +217,8 @@ def magnitude(node: Node) -> int:
 
 
 
-def read() -> Iterator[str]:
-    with open("d18/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_one(line: str) -> Node:
@@ -267,6 +267,14 @@ def _parse_literal(literal: int | list) -> Node:
     )
 
 
+def solve(nodes: Iterable[Node]) -> int:
+    """
+    >>> solve(parse(["[1,2]", "[[3,4],5]"]))
+    143
+    """
+    nodes = iter(nodes)
+    return magnitude(sum(nodes, start=next(nodes)))
+
+
 if __name__ == "__main__":
-    nodes = parse(read())
-    print(magnitude(sum(nodes, start=next(nodes))))
+    print(solve(parse(read(loader.from_argv(__file__)))))
@@ -1,14 +1,22 @@
 from itertools import permutations
+from typing import Iterable
 
-from part1 import magnitude, parse_one, read
+from advent2021 import loader
+from d18.part1 import magnitude, parse_one, read
 
 
-if __name__ == "__main__":
-    print(
-        max(
-            magnitude(
-                parse_one(a) + parse_one(b),
-            )
-            for a, b in permutations(read(), 2)
+def solve(lines: Iterable[str]) -> int:
+    """
+    >>> solve(["[1,2]", "[[3,4],5]"])
+    197
+    """
+    return max(
+        magnitude(
+            parse_one(a) + parse_one(b),
         )
+        for a, b in permutations(lines, 2)
     )
+
+
+if __name__ == "__main__":
+    print(solve(read(loader.from_argv(__file__))))
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import itertools
 from dataclasses import astuple, dataclass, field
-from typing import Iterable, Iterator, cast
+from typing import Iterable, Iterator
 
-import parse
+from advent2021 import lineparse, loader
 
 
 @dataclass(frozen=True, slots=True)
@@ -72,14 +72,12 @@ def orientations(positions: Iterable[Vector]) -> Iterator[set[Vector]]:
         yield set(new)
 
 
-HEADER = parse.compile("--- scanner {scanner:d} ---")
-POSITION = parse.compile("{x:d},{y:d},{z:d}")
+HEADER = lineparse.compile("--- scanner {scanner:d} ---")
+POSITION = lineparse.compile("{x:d},{y:d},{z:d}")
 
 
-def read():
-    with open("d19/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)):
+    return loader.lines(source)
 
 
 def parse_scanners(lines: Iterable[str]) -> Iterator[Scanner]:
@@ -94,9 +92,8 @@ def parse_scanners(lines: Iterable[str]) -> Iterator[Scanner]:
             scanner = Scanner()
             continue
 
-        result = cast(parse.Result, POSITION.parse(line))
         assert scanner is not None
-        scanner.beacons.add(Vector(result["x"], result["y"], result["z"]))
+        scanner.beacons.add(Vector(*POSITION.fields(line)))
 
     if scanner:
         yield scanner
@@ -117,7 +114,10 @@ def align_all(scanners: Iterable[Scanner]) -> None:
         unaligned -= aligned
 
 
-if __name__ == "__main__":
-    scanners = list(parse_scanners(read()))
+def solve(scanners: list[Scanner]) -> int:
     align_all(scanners)
-    print(len(set(itertools.chain(*(scanner.beacons for scanner in scanners)))))
+    return len(set(itertools.chain(*(scanner.beacons for scanner in scanners))))
+
+
+if __name__ == "__main__":
+    print(solve(list(parse_scanners(read(loader.from_argv(__file__))))))
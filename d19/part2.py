@@ -1,6 +1,7 @@
 import itertools
 
-from part1 import Vector, parse_scanners, read, align_all
+from advent2021 import loader
+from d19.part1 import Scanner, Vector, parse_scanners, read, align_all
 
 
 def manhattan_distance(v1: Vector, v2: Vector):
@@ -13,12 +14,13 @@ def manhattan_distance(v1: Vector, v2: Vector):
     return sum(abs(d) for d in v1 - v2)
 
 
-if __name__ == "__main__":
-    sensors = parse_scanners(read())
+def solve(sensors: list[Scanner]) -> int:
     align_all(sensors)
-    print(
-        max(
-            manhattan_distance(*p)
-            for p in itertools.combinations((s.origin for s in sensors), 2)
-        )
+    return max(
+        manhattan_distance(*p)
+        for p in itertools.combinations((s.origin for s in sensors), 2)
     )
+
+
+if __name__ == "__main__":
+    print(solve(list(parse_scanners(read(loader.from_argv(__file__))))))
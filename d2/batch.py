@@ -0,0 +1,185 @@
+"""Evaluate a whole log of commands at once with prefix sums.
+
+The aim when moving forward is the sum of every up and down before it, so
+with the commands as parallel arrays of opcodes and values:
+
+    aim = cumsum(down - up)
+    depth = sum(aim * forward)
+
+A chunk of the log moves the submarine by some `Course`. Running one course
+after another only adds the first's aim to the second's forward moves, so
+chunks can be evaluated independently, in separate processes even, and their
+courses combined in order:
+
+    $ python -m d2.batch commands.txt --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import concurrent.futures
+import functools
+import time
+from dataclasses import dataclass
+from typing import Final, Iterable
+
+from advent2021 import loader
+from advent2021.optional import numpy
+
+COMMANDS: Final[tuple[bytes, ...]] = (b"forward", b"down", b"up")
+FORWARD, DOWN, UP = range(len(COMMANDS))
+CHUNK_SIZE: Final[int] = 1 << 22
+# NOTE: Chunks queued per process, enough to keep every process busy.
+IN_FLIGHT: Final[int] = 2
+
+
+@dataclass(frozen=True)
+class Course:
+    """How far a run of commands moves the submarine, starting from aim 0.
+
+    The aim is also the depth of part 1.
+    """
+
+    position: int = 0
+    depth: int = 0
+    aim: int = 0
+
+    def then(self, other: Course) -> Course:
+        """This course followed by `other`.
+
+        >>> Course(5, 0, 5).then(Course(8, 40, 3))
+        Course(position=13, depth=80, aim=8)
+        """
+        return Course(
+            self.position + other.position,
+            self.depth + other.depth + self.aim * other.position,
+            self.aim + other.aim,
+        )
+
+
+def parse(text: bytes) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Parallel arrays of the opcodes and values of every command.
+
+    The bytes are parsed in place: the command is told by its first letter and
+    the value is summed from its digits, weighted by their distance to the last
+    digit of the line.
+
+    >>> opcodes, values = parse(b"forward 5\\ndown 15\\nup 3")
+    >>> opcodes.tolist(), values.tolist()
+    ([0, 1, 2], [5, 15, 3])
+    >>> parse(b"forward 5 \\r\\ndown 15\\r\\n")[1].tolist()
+    [5, 15]
+    >>> parse(b" \\n")[0].tolist()
+    []
+    """
+    text = text.rstrip()
+    if not text:
+        return numpy.empty(0, numpy.int8), numpy.empty(0, numpy.int64)
+    text += b"\n"
+    chars = numpy.frombuffer(text, numpy.uint8)
+    ends = numpy.flatnonzero(chars == ord("\n"))
+    starts = numpy.concatenate([[0], ends[:-1] + 1])
+
+    letters = numpy.full(256, -1, numpy.int8)
+    for opcode, command in enumerate(COMMANDS):
+        letters[command[0]] = opcode
+    opcodes = letters[chars[starts]]
+    if (opcodes < 0).any():
+        line = text[starts[opcodes < 0][0] :].split(b"\n", 1)[0]
+        raise ValueError(f"unknown command {line.decode()!r}")
+
+    digits = numpy.flatnonzero((chars >= ord("0")) & (chars <= ord("9")))
+    lines = numpy.searchsorted(ends, digits)
+    # NOTE: Digits are in order, so the last of each line is the one before the
+    # first digit of the next line.
+    last = digits[numpy.searchsorted(lines, lines, side="right") - 1]
+    powers = 10 ** (last - digits)
+    values = numpy.bincount(
+        lines, (chars[digits] - ord("0")) * powers, minlength=len(ends)
+    )
+    return opcodes, values.astype(numpy.int64)
+
+
+def evaluate(opcodes: numpy.ndarray, values: numpy.ndarray) -> Course:
+    """
+    >>> evaluate(*parse(b"forward 5\\ndown 5\\nforward 8\\nup 3\\ndown 8\\nforward 2"))
+    Course(position=15, depth=60, aim=10)
+    """
+    forward = numpy.where(opcodes == FORWARD, values, 0)
+    aims = numpy.cumsum(
+        numpy.where(opcodes == DOWN, values, 0) - numpy.where(opcodes == UP, values, 0)
+    )
+    return Course(
+        position=int(forward.sum()),
+        depth=int(numpy.dot(aims, forward)),
+        aim=int(aims[-1]) if aims.size else 0,
+    )
+
+
+def evaluate_text(text: bytes) -> Course:
+    if numpy is not None:
+        return evaluate(*parse(text))
+
+    course = Course()
+    words = text.split()
+    for command, value in zip(words[0::2], map(int, words[1::2])):
+        match command:
+            case b"forward":
+                course = course.then(Course(position=value))
+            case b"down":
+                course = course.then(Course(aim=value))
+            case b"up":
+                course = course.then(Course(aim=-value))
+            case _:
+                raise ValueError(f"unknown command {command.decode()!r}")
+    return course
+
+
+def evaluate_chunks(chunks: Iterable[bytes], jobs: int = 1) -> Course:
+    """The course of consecutive chunks of commands, evaluated by `jobs`
+    processes.
+
+    Only `IN_FLIGHT` chunks per process are read ahead, so the log is never
+    held in memory whole.
+
+    >>> lines = b"forward 5\\ndown 5\\nforward 8\\nup 3\\ndown 8\\nforward 2\\n"
+    >>> evaluate_chunks([lines[:17], lines[17:]])
+    Course(position=15, depth=60, aim=10)
+    >>> evaluate_chunks([lines[:10], lines[10:17], lines[17:]], jobs=2)
+    Course(position=15, depth=60, aim=10)
+    """
+    if jobs == 1:
+        courses = map(evaluate_text, chunks)
+        return functools.reduce(Course.then, courses, Course())
+
+    course = Course()
+    pending: collections.deque[concurrent.futures.Future[Course]] = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        for chunk in chunks:
+            if len(pending) == IN_FLIGHT * jobs:
+                course = course.then(pending.popleft().result())
+            pending.append(pool.submit(evaluate_text, chunk))
+
+        while pending:
+            course = course.then(pending.popleft().result())
+    return course
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m d2.batch")
+    parser.add_argument("source", nargs="?", default=loader.default(__file__))
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    course = evaluate_chunks(loader.line_chunks(args.source, CHUNK_SIZE), args.jobs)
+    elapsed = time.perf_counter() - start
+
+    print(course.position * course.aim)
+    print(course.position * course.depth)
+    print(f"evaluated in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
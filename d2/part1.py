@@ -1,21 +1,17 @@
-from typing import Iterable, Iterator, cast
+from typing import Iterable, Iterator
 
-import parse
+from advent2021 import lineparse, loader
 
-instruction_parser = parse.compile("{command:w} {value:d}")
+instruction_parser = lineparse.compile("{command:w} {value:d}")
 
 
-def read() -> Iterator[str]:
-    with open("d2/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_instruction(instruction) -> tuple[str, int]:
-    result = instruction_parser.parse(instruction)
-    assert result is not None
-    result = cast(parse.Result, result)
-    return result["command"], result["value"]
+    command, value = instruction_parser.fields(instruction)
+    return command, value
 
 
 def evaluate(instructions: Iterable[tuple[str, int]]):
@@ -33,6 +29,7 @@ def evaluate(instructions: Iterable[tuple[str, int]]):
 
 
 if __name__ == "__main__":
-    instructions = (parse_instruction(instruction) for instruction in read())
+    lines = read(loader.from_argv(__file__))
+    instructions = (parse_instruction(instruction) for instruction in lines)
     position, depth = evaluate(instructions)
     print(position * depth)
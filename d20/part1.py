@@ -4,6 +4,8 @@ import itertools
 from dataclasses import dataclass, field
 from typing import Iterator, Literal, TypeAlias
 
+from advent2021 import loader
+
 Position: TypeAlias = tuple[int, int]
 PixelValue: TypeAlias = Literal[0, 1]
 Algorithm: TypeAlias = list[PixelValue]
@@ -120,10 +122,8 @@ def next_image(algorithm: Algorithm, image: Image) -> Image:
     return next_image
 
 
-def read() -> Iterator[str]:
-    with open("d20/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def read_algorithm(lines: Iterator[str]) -> Algorithm:
@@ -146,8 +146,16 @@ def load(lines: Iterator[str]) -> tuple[Algorithm, Image]:
     return read_algorithm(lines), read_image(lines)
 
 
-if __name__ == "__main__":
-    algorithm, image = load(read())
-    for _ in range(2):
+def enhance(loaded: tuple[Algorithm, Image], times: int) -> int:
+    algorithm, image = loaded
+    for _ in range(times):
         image = next_image(algorithm, image)
-    print(image.count)
+    return image.count
+
+
+def solve(loaded: tuple[Algorithm, Image]) -> int:
+    return enhance(loaded, 2)
+
+
+if __name__ == "__main__":
+    print(solve(load(read(loader.from_argv(__file__)))))
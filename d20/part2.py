@@ -1,9 +1,10 @@
-from part1 import load, next_image, read
+from advent2021 import loader
+from d20.part1 import Algorithm, Image, enhance, load, read
 
 
-if __name__ == "__main__":
-    algorithm, image = load(read())
-    for _ in range(50):
-        image = next_image(algorithm, image)
+def solve(loaded: tuple[Algorithm, Image]) -> int:
+    return enhance(loaded, 50)
+
 
-    print(image.count)
+if __name__ == "__main__":
+    print(solve(load(read(loader.from_argv(__file__)))))
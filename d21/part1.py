@@ -3,13 +3,14 @@ from itertools import cycle
 from typing import Iterable, Iterator, cast
 import parse
 
+from advent2021 import loader
+
 FORMAT = parse.compile("Player {player:d} starting position: {position:d}")
 
 
-def read() -> Iterator[int]:
-    with open("d21/input.txt") as f:
-        for line in f:
-            yield cast(parse.Result, FORMAT.parse(line.strip()))["position"]
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[int]:
+    for line in loader.lines(source):
+        yield cast(parse.Result, FORMAT.parse(line))["position"]
 
 
 def deterministic_dice():
@@ -47,4 +48,4 @@ def play(player_starts: Iterable[int]) -> int:
 
 
 if __name__ == "__main__":
-    print(play(read()))
+    print(play(read(loader.from_argv(__file__))))
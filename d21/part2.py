@@ -6,7 +6,8 @@ from functools import cache, cached_property
 from itertools import product
 from typing import Literal, TypeAlias, cast
 
-from part1 import read
+from advent2021 import loader
+from d21.part1 import read
 
 PlayerIndex: TypeAlias = Literal[0, 1]
 
@@ -74,5 +75,6 @@ def traverse(state: GameState, player: PlayerIndex = 0, universes: int = 1):
 
 
 if __name__ == "__main__":
-    position = cast(tuple[PlayerIndex, PlayerIndex], tuple(read()))
+    positions = read(loader.from_argv(__file__))
+    position = cast(tuple[PlayerIndex, PlayerIndex], tuple(positions))
     print(max(traverse(GameState(position)).values()))
@@ -2,20 +2,20 @@ from dataclasses import dataclass, field
 from itertools import product
 from typing import Iterable, Iterator, TypeAlias, cast, overload
 
-import parse
+from advent2021 import lineparse, loader
 
 Coord: TypeAlias = tuple[int, int, int]
 Range: TypeAlias = tuple[int, int]
 CubeOp: TypeAlias = tuple[bool, Range, Range, Range]
 CubeOps: TypeAlias = Iterator[CubeOp]
 
-FORMAT = parse.compile("{state:l} x={x0:d}..{x1:d},y={y0:d}..{y1:d},z={z0:d}..{z1:d}")
+FORMAT = lineparse.compile(
+    "{state:l} x={x0:d}..{x1:d},y={y0:d}..{y1:d},z={z0:d}..{z1:d}"
+)
 
 
-def read() -> Iterator[str]:
-    with open("d22/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 @dataclass
@@ -32,12 +32,10 @@ class Reactor:
     cubes_on: set[Coord] = field(default_factory=set)
 
     @overload
-    def __setitem__(self, key: Coord, value: bool) -> None:
-        ...
+    def __setitem__(self, key: Coord, value: bool) -> None: ...
 
     @overload
-    def __setitem__(self, key: tuple[slice, slice, slice], value: bool) -> None:
-        ...
+    def __setitem__(self, key: tuple[slice, slice, slice], value: bool) -> None: ...
 
     def __setitem__(self, key, value: bool) -> None:
         if all(isinstance(v, slice) for v in key):
@@ -68,22 +66,20 @@ def bound(cubes: CubeOps, bounds: tuple[int, int] = (-50, 51)) -> CubeOps:
 
 def load(lines: Iterable[str]) -> CubeOps:
     for line in lines:
-        result = cast(parse.Result | None, FORMAT.parse(line))
-        assert result is not None
-        yield (
-            result["state"] == "on",
-            (result["x0"], result["x1"] + 1),
-            (result["y0"], result["y1"] + 1),
-            (result["z0"], result["z1"] + 1),
-        )
+        state, x0, x1, y0, y1, z0, z1 = FORMAT.fields(line)
+        yield state == "on", (x0, x1 + 1), (y0, y1 + 1), (z0, z1 + 1)
 
 
-if __name__ == "__main__":
+def solve(operations: Iterable[CubeOp]) -> int:
     reactor = Reactor()
-    for state, (x0, x1), (y0, y1), (z0, z1) in bound(load(read())):
+    for state, (x0, x1), (y0, y1), (z0, z1) in operations:
         reactor[
             x0:x1,
             y0:y1,
             z0:z1,
         ] = state
-    print(reactor.count())
+    return reactor.count()
+
+
+if __name__ == "__main__":
+    print(solve(bound(load(read(loader.from_argv(__file__))))))
@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable, Iterable, Iterator, ParamSpec, TypeAlias
 
-from part1 import CubeOps, load, read
+from advent2021 import loader
+from d22.part1 import CubeOps, load, read
 
 Range: TypeAlias = tuple[int, int]
 
@@ -177,5 +178,5 @@ def total(cubes: Iterable[Cube]) -> int:
 
 
 if __name__ == "__main__":
-    cubes = reactor_reboot(load_cubes(load(read())))
+    cubes = reactor_reboot(load_cubes(load(read(loader.from_argv(__file__)))))
     print(total(cubes))
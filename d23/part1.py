@@ -5,6 +5,8 @@ from functools import cache, cached_property
 from itertools import islice
 from typing import Final, Iterator, Literal, TypeAlias, cast
 
+from advent2021 import loader
+
 
 Position: TypeAlias = tuple[int, int]
 Amphipod: TypeAlias = Literal["A", "B", "C", "D"]
@@ -223,13 +225,14 @@ def minimise_cost(state: State, target: State) -> int | None:
     )
 
 
-def read() -> Iterator[tuple[Position, Amphipod]]:
-    with open("d23/input.txt") as f:
-        for y, line in enumerate(islice(f, 1, None)):
-            for x, c in enumerate(line[1:]):
-                if c not in {"A", "B", "C", "D"}:
-                    continue
-                yield (x, y), cast(Amphipod, c)
+def read(
+    source: loader.Source = loader.default(__file__),
+) -> Iterator[tuple[Position, Amphipod]]:
+    for y, line in enumerate(islice(loader.lines(source), 1, None)):
+        for x, c in enumerate(line[1:]):
+            if c not in {"A", "B", "C", "D"}:
+                continue
+            yield (x, y), cast(Amphipod, c)
 
 
 def load(board: Iterator[tuple[Position, Amphipod]], room_size: int = 2) -> State:
@@ -255,20 +258,25 @@ def load(board: Iterator[tuple[Position, Amphipod]], room_size: int = 2) -> Stat
     return State(frozenset(board), room_size=room_size)
 
 
-if __name__ == "__main__":
-    initial = load(read())
-    target = State(
+def organised(room_size: int = 2) -> State:
+    """The state with every amphipod in its own room.
+
+    >>> sorted(organised(room_size=1).board)
+    [((2, 1), 'A'), ((4, 1), 'B'), ((6, 1), 'C'), ((8, 1), 'D')]
+    """
+    return State(
         frozenset(
-            [
-                ((2, 1), "A"),
-                ((2, 2), "A"),
-                ((4, 1), "B"),
-                ((4, 2), "B"),
-                ((6, 1), "C"),
-                ((6, 2), "C"),
-                ((8, 1), "D"),
-                ((8, 2), "D"),
-            ]
-        )
+            ((x, y), amphipod)
+            for amphipod, x in DESTINATION.items()
+            for y in range(1, room_size + 1)
+        ),
+        room_size=room_size,
     )
-    print(minimise_cost(initial, target))
+
+
+def solve(initial: State) -> int | None:
+    return minimise_cost(initial, organised(initial.room_size))
+
+
+if __name__ == "__main__":
+    print(solve(load(read(loader.from_argv(__file__)))))
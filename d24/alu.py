@@ -3,6 +3,8 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Iterable, Iterator, Literal, TypeAlias, cast
 
+from advent2021 import loader
+
 Variable: TypeAlias = Literal["w", "x", "y", "z"]
 Operation: TypeAlias = (
     tuple[Literal["inp"], Variable]
@@ -34,10 +36,8 @@ def base26(number: int) -> str:
     return "".join(digits)
 
 
-def read() -> Iterator[str]:
-    with open("d24/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def load(lines: Iterable[str]) -> Iterator[Operation]:
@@ -2,7 +2,8 @@ from collections import UserDict
 from itertools import product
 from typing import Iterable, Literal, TypeVar
 
-from alu import ALU, load, read
+from advent2021 import loader
+from d24.alu import ALU, Operation, load, read
 
 
 def propagate(key: int, value: int):
@@ -67,8 +68,12 @@ def first(it: Iterable[T]) -> T:
     assert False
 
 
-if __name__ == "__main__":
+def solve(operations: Iterable[Operation]) -> int:
     result = first(values(-1))
-    alu_result = ALU().execute(load(read()), result)
+    alu_result = ALU().execute(operations, result)
     assert alu_result == 0, f"ALU return non-zero ({alu_result}) for ({result = })"
-    print(result)
+    return result
+
+
+if __name__ == "__main__":
+    print(solve(load(read(loader.from_argv(__file__)))))
@@ -1,4 +1,4 @@
-from part1 import values, first
+from d24.part1 import values, first
 
 
 if __name__ == "__main__":
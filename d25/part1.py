@@ -1,144 +1,82 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Iterator
+from typing import Final, Iterable, Iterator
 
+from advent2021 import loader
+from advent2021.grid import Coord, Grid
+from advent2021.optional import numpy
 
-def read() -> Iterator[str]:
-    with open("d25/input.txt") as f:
-        for l in f:
-            yield l.strip()
+SYMBOLS: Final[bytes] = b".>v"
+EMPTY, EAST, SOUTH = range(len(SYMBOLS))
 
+# NOTE: Herds in the order they move, with the (row, col) step they take.
+HERDS: Final[tuple[tuple[int, Coord], ...]] = ((EAST, (0, 1)), (SOUTH, (1, 0)))
 
-def parse_row(line: str):
-    east = Vector(x=1, y=0)
-    south = Vector(x=0, y=1)
-    for character in line:
-        match character:
-            case ".":
-                yield None
 
-            case "v":
-                yield SeaCucumber(south)
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
-            case ">":
-                yield SeaCucumber(east)
 
+def load(lines: Iterable[str]) -> Grid:
+    return Grid.parse("\n".join(lines), SYMBOLS)
 
-def load(lines: Iterable[str]):
-    return Board([list(parse_row(line)) for line in lines])
 
+def movements(board: Grid, herd: int, direction: Coord) -> dict[Coord, Coord]:
+    return dict(_movements(board, herd, direction))
 
-@dataclass(frozen=True, eq=True)
-class Vector:
-    x: int
-    y: int
-
-    def __add__(self, other: Vector) -> Vector:
-        """
-        >>> Vector(1, 2) + Vector(2, 1)
-        Vector(x=3, y=3)
-        """
-        return Vector(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other: Vector) -> Vector:
-        """
-        >>> Vector(1, 2) - Vector(2, 1)
-        Vector(x=-1, y=1)
-        """
-        return Vector(self.x - other.x, self.y - other.y)
-
-    def __iter__(self) -> Iterator[int]:
-        yield self.x
-        yield self.y
-
-    def __mod__(self, other: Vector) -> Vector:
-        """
-        >>> Vector(-1, -1) % Vector(5, 5)
-        Vector(x=4, y=4)
-        >>> Vector(6, 6) % Vector(5, 5)
-        Vector(x=1, y=1)
-        """
-        return Vector(self.x % other.x, self.y % other.y)
-
-    def __getitem__(self, p: int) -> int:
-        if p == 0:
-            return self.x
-        if p == 1:
-            return self.y
-
-        raise IndexError(p)
-
-
-@dataclass
-class SeaCucumber:
-    direction: Vector
-
-
-@dataclass
-class Board:
-    board: list[list[SeaCucumber | None]]
-
-    def __setitem__(self, key: Vector, value: SeaCucumber | None):
-        self.board[key.y][key.x] = value
-
-    def __getitem__(self, key: Vector) -> SeaCucumber | None:
-        return self.board[key.y][key.x]
-
-    def pop(self, key: Vector) -> SeaCucumber | None:
-        value = self[key]
-        self[key] = None
-        return value
-
-    def __iter__(self) -> Iterator[Vector]:
-        width, height = self.size
-        for y in range(height):
-            for x in range(width):
-                yield Vector(x, y)
-
-    @property
-    def size(self) -> Vector:
-        if not self.board:
-            return Vector(0, 0)
-
-        return Vector(len(self.board[0]), len(self.board))
 
+def _movements(
+    board: Grid, herd: int, direction: Coord
+) -> Iterator[tuple[Coord, Coord]]:
+    for (row, col), value in board.items():
+        if value != herd:
+            continue
 
-def movements(board: Board, direction: Vector) -> dict[Vector, Vector]:
-    return dict(_movements(board, direction))
+        stop = (row + direction[0]) % board.height, (col + direction[1]) % board.width
+        if board[stop] == EMPTY:
+            yield (row, col), stop
 
 
-def _movements(board: Board, direction: Vector) -> Iterator[tuple[Vector, Vector]]:
-    for start in board:
-        value = board[start]
-        if value is None:
-            continue
-
-        if value.direction != direction:
-            continue
+def _step_cells(board: Grid) -> bool:
+    changed = False
+    for herd, direction in HERDS:
+        for start, stop in movements(board, herd, direction).items():
+            changed = True
+            board[start] = EMPTY
+            board[stop] = herd
 
-        stop = (start + value.direction) % board.size
-        if board[stop] is None:
-            yield start, stop
+    return changed
 
 
-def step(board: Board):
-    east = Vector(1, 0)
-    south = Vector(0, 1)
+def _step_array(board: Grid) -> bool:
+    """Move each herd at once, as everyone in a herd looks before moving."""
+    cells = board.array
     changed = False
+    for herd, direction in HERDS:
+        axis = 0 if direction[0] else 1
+        moving = (cells == herd) & (numpy.roll(cells, -1, axis) == EMPTY)
+        cells[moving] = EMPTY
+        cells[numpy.roll(moving, 1, axis)] = herd
+        changed = changed or bool(moving.any())
 
-    for start, stop in movements(board, east).items():
-        changed = True
-        board[stop] = board.pop(start)
+    return changed
 
-    for start, stop in movements(board, south).items():
-        changed = True
-        board[stop] = board.pop(start)
 
-    return changed
+def step(board: Grid) -> bool:
+    """
+    >>> board = load(["...>>>>>..."])
+    >>> step(board), display(board)
+    (True, '...>>>>.>..')
+    >>> board = load([".>.", "..v", "..."])
+    >>> step(board), display(board)
+    (True, '..>\\n...\\n..v')
+    """
+    if numpy is not None:
+        return _step_array(board)
+    return _step_cells(board)
 
 
-def move(board: Board) -> Iterator[Board]:
+def move(board: Grid) -> Iterator[Grid]:
     while step(board):
         yield board
 
@@ -147,23 +85,9 @@ def ilen(it: Iterable) -> int:
     return sum(1 for _ in it)
 
 
-def display(value: SeaCucumber | Board | None) -> str:
-    match value:
-        case SeaCucumber(Vector(0, 1)):
-            return "v"
-
-        case SeaCucumber(Vector(1, 0)):
-            return ">"
-
-        case None:
-            return "."
-
-        case Board() as b:
-            return "\n".join("".join(display(item) for item in row) for row in b.board)
-
-        case _:
-            assert False, value
+def display(board: Grid) -> str:
+    return "\n".join("".join(chr(SYMBOLS[v]) for v in row) for row in board.rows())
 
 
 if __name__ == "__main__":
-    print(ilen(move(load(read()))) + 1)
+    print(ilen(move(load(read(loader.from_argv(__file__))))) + 1)
@@ -0,0 +1,139 @@
+"""Diagnostics over the report as integers rather than strings of digits.
+
+Gamma and epsilon only need how many numbers have each bit set. For the
+ratings the numbers are sorted once: the numbers sharing the bits chosen so
+far are then a contiguous range, and the ones of them with the next bit set
+are the end of that range, found by binary search. Each rating takes one
+search per bit rather than a pass over the remaining numbers.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from advent2021 import loader
+from advent2021.optional import numpy
+
+
+@dataclass(frozen=True)
+class Report:
+    """The numbers of a report in ascending order, all `bits` wide."""
+
+    numbers: Any
+    bits: int
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> Report:
+        """
+        >>> Report.parse(["101", "011"])
+        Report(numbers=[3, 5], bits=3)
+        """
+        lines = list(lines)
+        return cls(sorted(int(line, 2) for line in lines), len(lines[0]))
+
+    @classmethod
+    def read(cls, source: loader.Source) -> Report:
+        """The report in `source`, with numpy parsed as one array when every
+        line is as wide, ends in a bare newline and fits in 64 bits.
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile("wb") as f:
+        ...     _ = f.write(b"101\\r\\n011\\r\\n1" + b"0" * 64)
+        ...     f.flush()
+        ...     Report.read(f.name).numbers
+        [3, 5, 18446744073709551616]
+        """
+        if numpy is None:
+            return cls.parse(loader.lines(source))
+
+        text = b"".join(loader.chunks(source))
+        bits = text.find(b"\n")
+        if not 0 < bits <= 64 or len(text) % (bits + 1):
+            # NOTE: Digits hold no whitespace, so splitting on it drops any
+            # line ending and blank lines alike.
+            return cls.parse(text.decode().split())
+
+        # NOTE: Every line is as wide, so the digits line up in columns.
+        rows = numpy.frombuffer(text, numpy.uint8).reshape(-1, bits + 1)
+        digits = rows[:, :bits]
+        if (rows[:, bits] != ord("\n")).any() or (digits - ord("0") > 1).any():
+            return cls.parse(text.decode().split())
+
+        powers = numpy.left_shift(
+            numpy.uint64(1), numpy.arange(bits, dtype=numpy.uint64)
+        )
+        numbers = (digits == ord("1")) @ powers[::-1]
+        numbers.sort()
+        return cls(numbers, bits)
+
+    def ones(self) -> list[int]:
+        """How many numbers have each bit set, most significant first.
+
+        >>> Report.parse(["101", "011", "111"]).ones()
+        [2, 2, 3]
+        """
+        shifts = range(self.bits - 1, -1, -1)
+        if numpy is not None and isinstance(self.numbers, numpy.ndarray):
+            return [
+                int(numpy.count_nonzero(self.numbers & numpy.uint64(1 << s)))
+                for s in shifts
+            ]
+        return [sum(n >> s & 1 for n in self.numbers) for s in shifts]
+
+    def _first_at_least(self, value: int, lo: int, hi: int) -> int:
+        if numpy is not None and isinstance(self.numbers, numpy.ndarray):
+            return lo + int(numpy.searchsorted(self.numbers[lo:hi], value))
+        return bisect.bisect_left(self.numbers, value, lo, hi)
+
+    def rating(self, most_common: bool) -> int:
+        """The number left keeping those with the most (or least) common bit,
+        one bit at a time. Ties keep the 1s for the most common and the 0s for
+        the least common. A bit all the remaining numbers share is skipped.
+        """
+        lo, hi = 0, len(self.numbers)
+        prefix = 0
+        for shift in range(self.bits - 1, -1, -1):
+            if hi - lo == 1:
+                break
+
+            bit = 1 << shift
+            split = self._first_at_least(prefix | bit, lo, hi)
+            zeros, ones = split - lo, hi - split
+            if zeros and ones:
+                keep_ones = (ones >= zeros) == most_common
+            else:
+                keep_ones = bool(ones)
+
+            if keep_ones:
+                lo, prefix = split, prefix | bit
+            else:
+                hi = split
+
+        return int(self.numbers[lo])
+
+
+def power_consumption(report: Report) -> int:
+    """
+    >>> report = Report.parse(["00100", "11110", "10110", "10111", "10101",
+    ...     "01111", "00111", "11100", "10000", "11001", "00010", "01010"])
+    >>> power_consumption(report)
+    198
+    """
+    gamma = 0
+    for ones in report.ones():
+        gamma = gamma << 1 | (ones * 2 >= len(report.numbers))
+    return gamma * (gamma ^ (1 << report.bits) - 1)
+
+
+def life_support_rating(report: Report) -> int:
+    """
+    >>> report = Report.parse(["00100", "11110", "10110", "10111", "10101",
+    ...     "01111", "00111", "11100", "10000", "11001", "00010", "01010"])
+    >>> report.rating(most_common=True), report.rating(most_common=False)
+    (23, 10)
+    >>> life_support_rating(report)
+    230
+    """
+    return report.rating(most_common=True) * report.rating(most_common=False)
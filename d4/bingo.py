@@ -0,0 +1,164 @@
+"""Play bingo on any number of boards at once.
+
+An index from each number to every (board, row, col) holding it means a call
+only touches the boards that have the number. Each board keeps a count of the
+marked cells of every row and column, so a board has won as soon as one of
+the counts reaches the length of its line, with nothing rescanned.
+
+As every call is known upfront the game need not be played at all. With the
+boards as an array of the turn each cell is called on, a line is complete on
+the last turn of its cells and a board wins on the first of its lines to be
+complete, so every board's winning turn is a min of maxes over the array.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+
+from advent2021.optional import numpy
+
+if TYPE_CHECKING:
+    from d4.part2 import Board
+
+
+@dataclass(frozen=True)
+class Win:
+    call: int
+    board: int
+    score: int
+
+
+class Bingo:
+    """The state of a game on `boards`, numbered in order.
+
+    >>> from d4.part2 import Board
+    >>> bingo = Bingo([Board.from_str(" 1  2\\n 3  4"), Board.from_str(" 4  3\\n 5  6")])
+    >>> bingo.call(3), bingo.call(1), bingo.call(4)
+    ([], [0], [1])
+
+    A number called again has nothing left to mark.
+
+    >>> list(Bingo([Board.from_str(" 1  2\\n 3  4")]).play([1, 1, 5]))
+    []
+    """
+
+    def __init__(self, boards: Iterable[Board]) -> None:
+        self.boards = list(boards)
+        # NOTE: The rows and columns of every board share one list of counts,
+        # so the index can point straight at the two lines a cell is on.
+        self.marked: list[int] = []
+        self.lengths: list[int] = []
+        self.index: dict[int, list[tuple[int, int, int]]] = {}
+        for number, board in enumerate(self.boards):
+            rows = len(self.marked)
+            cols = rows + board.height
+            self.marked += [0] * (board.height + board.width)
+            self.lengths += [board.width] * board.height + [board.height] * board.width
+            for (row, col), value in board.items():
+                self.index.setdefault(value, []).append(
+                    (number, rows + row, cols + col)
+                )
+
+        self.unmarked = [sum(v for _, v in board.items()) for board in self.boards]
+        self.won = [False] * len(self.boards)
+
+    def call(self, value: int) -> list[int]:
+        """Mark `value` everywhere, returning the boards that won by it."""
+        marked, lengths, won = self.marked, self.lengths, self.won
+        winners = []
+        # NOTE: Popped so that a number called again is not marked twice.
+        for number, row, col in self.index.pop(value, ()):
+            if won[number]:
+                continue
+
+            self.unmarked[number] -= value
+            marked[row] += 1
+            marked[col] += 1
+            if marked[row] == lengths[row] or marked[col] == lengths[col]:
+                won[number] = True
+                winners.append(number)
+
+        return winners
+
+    def play(self, calls: Iterable[int]) -> Iterator[Win]:
+        """Every win in order, boards winning on the same call by number."""
+        for call in calls:
+            for number in sorted(self.call(call)):
+                yield Win(call, number, call * self.unmarked[number])
+
+
+def board_values(boards: Sequence[Board]) -> numpy.ndarray:
+    """The values of every board as one array of boards by rows by columns."""
+    sizes = {(board.height, board.width) for board in boards}
+    if len(sizes) != 1:
+        raise ValueError("boards must all be the same size")
+
+    ((height, width),) = sizes
+    values = [0] * (len(boards) * height * width)
+    for number, board in enumerate(boards):
+        start = number * height * width
+        for (row, col), value in board.items():
+            values[start + row * width + col] = value
+    return numpy.array(values, numpy.int64).reshape(len(boards), height, width)
+
+
+def call_turns(calls: Sequence[int], values: numpy.ndarray) -> numpy.ndarray:
+    """The turn each cell is first called on, `len(calls)` if it never is."""
+    never = len(calls)
+    turns = numpy.full(max(int(values.max()), max(calls)) + 1, never)
+    # NOTE: Reversed so the earliest turn of a number called twice is set last.
+    turns[numpy.array(calls[::-1])] = numpy.arange(never)[::-1]
+    return turns[values]
+
+
+def ranked_wins(calls: Sequence[int], values: numpy.ndarray) -> list[Win]:
+    """Every board that wins, in the order they win, without playing.
+
+    >>> values = numpy.array([[[1, 2], [3, 4]], [[4, 3], [5, 6]], [[7, 8], [9, 0]]])
+    >>> ranked_wins([3, 1, 4], values)
+    [Win(call=1, board=0, score=6), Win(call=4, board=1, score=44)]
+    """
+    turns = call_turns(calls, values)
+    won = numpy.minimum(
+        turns.max(axis=2).min(axis=1),
+        turns.max(axis=1).min(axis=1),
+    )
+    order = numpy.argsort(won, kind="stable")
+    order = order[won[order] < len(calls)]
+
+    unmarked = numpy.where(turns > won[:, None, None], values, 0).sum(axis=(1, 2))
+    called = numpy.array(calls)[won[order]]
+    return [
+        Win(call, board, call * total)
+        for call, board, total in zip(
+            called.tolist(), order.tolist(), unmarked[order].tolist()
+        )
+    ]
+
+
+def first_and_last(calls: Sequence[int], boards: Iterable[Board]) -> tuple[Win, Win]:
+    """The first and last boards to win.
+
+    With numpy the winners are worked out from the calls rather than played.
+
+    >>> from d4.part2 import Board
+    >>> calls, boards = [3, 1, 4], [Board.from_str(" 1  2\\n 3  4"),
+    ...     Board.from_str(" 4  3\\n 5  6")]
+    >>> first_and_last(calls, boards)
+    (Win(call=1, board=0, score=6), Win(call=4, board=1, score=44))
+    """
+    boards = list(boards)
+    if numpy is not None and len({(b.height, b.width) for b in boards}) == 1:
+        wins: Iterator[Win] = iter(ranked_wins(calls, board_values(boards)))
+    else:
+        wins = Bingo(boards).play(calls)
+
+    first = next(wins, None)
+    if first is None:
+        raise ValueError("no board wins")
+
+    last = first
+    for last in wins:
+        pass
+    return first, last
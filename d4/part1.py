@@ -1,6 +1,9 @@
 from dataclasses import dataclass, field
 from typing import Iterator
 
+from advent2021 import loader
+from d4.bingo import first_and_last
+
 Pos = tuple[int, int]
 
 
@@ -70,12 +73,13 @@ class Board:
             yield pos
 
 
-def read() -> tuple[list[int], list[Board]]:
-    with open("d4/input.txt") as f:
-        data = f.read().split("\n\n")
-        calls = [int(i) for i in data[0].split(",")]
-        boards = [Board.from_str(string) for string in data[1:]]
-        return calls, boards
+def read(
+    source: loader.Source = loader.default(__file__),
+) -> tuple[list[int], list[Board]]:
+    data = loader.text(source).split("\n\n")
+    calls = [int(i) for i in data[0].split(",")]
+    boards = [Board.from_str(string) for string in data[1:]]
+    return calls, boards
 
 
 def get_score(calls: list[int], boards: list[Board]) -> int | None:
@@ -88,4 +92,5 @@ def get_score(calls: list[int], boards: list[Board]) -> int | None:
 
 
 if __name__ == "__main__":
-    print(get_score(*read()))
+    first, _ = first_and_last(*read(loader.from_argv(__file__)))
+    print(first.score)
@@ -1,6 +1,9 @@
 from dataclasses import dataclass, field
 from typing import Iterator, TypeVar
 
+from advent2021 import loader
+from d4.bingo import first_and_last
+
 Pos = tuple[int, int]
 
 
@@ -73,12 +76,13 @@ class Board:
             yield pos
 
 
-def read() -> tuple[list[int], set[Board]]:
-    with open("d4/input.txt") as f:
-        data = f.read().split("\n\n")
-        calls = [int(i) for i in data[0].split(",")]
-        boards = {Board.from_str(string) for string in data[1:]}
-        return calls, boards
+def read(
+    source: loader.Source = loader.default(__file__),
+) -> tuple[list[int], set[Board]]:
+    data = loader.text(source).split("\n\n")
+    calls = [int(i) for i in data[0].split(",")]
+    boards = {Board.from_str(string) for string in data[1:]}
+    return calls, boards
 
 
 def play(calls: list[int], boards: set[Board]) -> Iterator[tuple[int, Board]]:
@@ -109,5 +113,5 @@ def last(iter: Iterator[T]) -> T:
 
 
 if __name__ == "__main__":
-    call, board = last(play(*read()))
-    print(call * board.total_unmarked)
+    _, last_win = first_and_last(*read(loader.from_argv(__file__)))
+    print(last_win.score)
@@ -0,0 +1,257 @@
+"""Count the points where vent lines overlap, without tracing every point.
+
+When the lines fit in a small box every point of every line is rasterised
+into flat indices of the box and counted in one go with numpy.
+
+Otherwise the lines are grouped into families of parallel lines: horizontal,
+vertical, and the two diagonals, each line of a family known by a key (its y
+for horizontal lines, x + y for diagonals going down, ...). Overlaps are then
+of two kinds:
+
+* Stretches of one line covered by two or more segments, found by sweeping
+  over the sorted ends of the segments on that line.
+* Points where lines of two families cross, found for each pair of families
+  by a sweep line after changing coordinates so that one family is
+  horizontal and the other vertical.
+
+A crossing can lie on stretches that are already counted, so the total is
+the length of the stretches, less the points where stretches cross, plus the
+crossings that lie on no stretch.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+from typing import TYPE_CHECKING, Final, Iterable, Iterator, TypeAlias
+
+from advent2021.optional import numpy
+
+if TYPE_CHECKING:
+    from d5.part2 import Coord
+
+Point: TypeAlias = tuple[int, int]
+Segment: TypeAlias = tuple[int, int, int, int]
+Span: TypeAlias = tuple[int, int]
+
+# NOTE: Largest bounding box, in points, counted with a dense array.
+DENSE_POINTS: Final[int] = 1 << 24
+
+# NOTE: For each family, (direction, normal) such that the lines of the family
+# are `normal . p = key` and their points `p = start + t * direction`.
+FAMILIES: Final[dict[str, tuple[Point, Point]]] = {
+    "horizontal": ((1, 0), (0, 1)),
+    "vertical": ((0, 1), (1, 0)),
+    "down": ((1, -1), (1, 1)),
+    "up": ((1, 1), (-1, 1)),
+}
+
+
+def segments(lines: Iterable[tuple[Coord, Coord]], diagonals: bool) -> list[Segment]:
+    """The horizontal, vertical and (if `diagonals`) diagonal lines."""
+    return [
+        (start.x, start.y, finish.x, finish.y)
+        for start, finish in lines
+        if start.x == finish.x
+        or start.y == finish.y
+        or (diagonals and abs(start.x - finish.x) == abs(start.y - finish.y))
+    ]
+
+
+def count_dense(lines: list[Segment]) -> int:
+    """
+    >>> count_dense([(0, 9, 5, 9), (0, 9, 2, 9), (1, 1, 3, 3), (3, 1, 1, 3)])
+    4
+    """
+    x1, y1, x2, y2 = numpy.array(lines, numpy.int64).reshape(-1, 4).T
+    left, top = min(x1.min(), x2.min()), min(y1.min(), y2.min())
+    width = max(x1.max(), x2.max()) - left + 1
+    height = max(y1.max(), y2.max()) - top + 1
+
+    lengths = numpy.maximum(abs(x2 - x1), abs(y2 - y1)) + 1
+    starts = (y1 - top) * width + (x1 - left)
+    steps = numpy.sign(y2 - y1) * width + numpy.sign(x2 - x1)
+    # NOTE: How far along its line each point is, for all points at once.
+    along = numpy.arange(lengths.sum()) - numpy.repeat(
+        lengths.cumsum() - lengths, lengths
+    )
+    points = numpy.repeat(starts, lengths) + numpy.repeat(steps, lengths) * along
+
+    counts = numpy.bincount(points, minlength=width * height)
+    return int(numpy.count_nonzero(counts > 1))
+
+
+def _family(line: Segment) -> tuple[str, int, Span]:
+    """Family, key and span along the line of `line`."""
+    x1, y1, x2, y2 = line
+    if y1 == y2:
+        return "horizontal", y1, (min(x1, x2), max(x1, x2))
+    if x1 == x2:
+        return "vertical", x1, (min(y1, y2), max(y1, y2))
+    if (x2 - x1) * (y2 - y1) > 0:
+        return "up", y1 - x1, (min(x1, x2), max(x1, x2))
+    return "down", x1 + y1, (min(x1, x2), max(x1, x2))
+
+
+def _point(family: str, key: int, t: int) -> Point:
+    """The point `t` along the line `key` of `family`."""
+    if family == "horizontal":
+        return t, key
+    if family == "vertical":
+        return key, t
+    if family == "up":
+        return t, t + key
+    return t, key - t
+
+
+def _along(family: str, point: Point) -> tuple[int, int]:
+    """Key of the line of `family` through `point` and how far along it is."""
+    normal = FAMILIES[family][1]
+    key = normal[0] * point[0] + normal[1] * point[1]
+    return key, point[1] if family == "vertical" else point[0]
+
+
+def _cover(spans: list[Span]) -> tuple[list[Span], list[Span]]:
+    """Stretches covered at least once and at least twice by `spans`.
+
+    >>> _cover([(0, 5), (3, 8), (10, 12), (4, 4)])
+    ([(0, 8), (10, 12)], [(3, 5)])
+    """
+    events = sorted([(lo, 1) for lo, _ in spans] + [(hi + 1, -1) for _, hi in spans])
+    once: list[Span] = []
+    twice: list[Span] = []
+    depth = 0
+    for position, change in events:
+        before, depth = depth, depth + change
+        for covered, threshold in ((once, 1), (twice, 2)):
+            if before < threshold <= depth:
+                if covered and covered[-1][1] == position - 1:
+                    covered[-1] = (covered[-1][0], position)
+                else:
+                    covered.append((position, position))
+            elif depth < threshold <= before:
+                covered[-1] = (covered[-1][0], position - 1)
+
+    return once, twice
+
+
+def _crossings(
+    horizontal: list[tuple[int, int, int]], vertical: list[tuple[int, int, int]]
+) -> Iterator[Point]:
+    """Where `(v, u_lo, u_hi)` horizontal spans cross `(u, v_lo, v_hi)` vertical
+    spans, as `(u, v)`.
+
+    Sweeps along u, keeping the vs of the horizontal spans it is over sorted.
+    """
+    ADD, QUERY, REMOVE = range(3)
+    events = [(lo, ADD, v, v) for v, lo, _ in horizontal]
+    events += [(hi, REMOVE, v, v) for v, _, hi in horizontal]
+    events += [(u, QUERY, lo, hi) for u, lo, hi in vertical]
+    events.sort()
+
+    active: list[int] = []
+    for u, kind, lo, hi in events:
+        if kind == ADD:
+            bisect.insort(active, lo)
+        elif kind == REMOVE:
+            del active[bisect.bisect_left(active, lo)]
+        else:
+            for v in active[
+                bisect.bisect_left(active, lo) : bisect.bisect_right(active, hi)
+            ]:
+                yield u, v
+
+
+def _family_crossings(
+    first: str,
+    first_lines: dict[int, list[Span]],
+    second: str,
+    second_lines: dict[int, list[Span]],
+) -> Iterator[Point]:
+    """Points where lines of the `first` family cross the `second`'s.
+
+    Measured by u = second's normal . p and v = first's normal . p, lines of
+    the first family are horizontal and of the second vertical.
+    """
+    (ax, ay), (bx, by) = FAMILIES[second][1], FAMILIES[first][1]
+
+    def spans(
+        family: str, lines: dict[int, list[Span]], normal: Point
+    ) -> Iterator[tuple[int, int, int]]:
+        for key, covered in lines.items():
+            for lo, hi in covered:
+                ends = [_point(family, key, t) for t in (lo, hi)]
+                lo_hi = sorted(normal[0] * x + normal[1] * y for x, y in ends)
+                yield key, lo_hi[0], lo_hi[1]
+
+    determinant = ax * by - ay * bx
+    for u, v in _crossings(
+        list(spans(first, first_lines, (ax, ay))),
+        list(spans(second, second_lines, (bx, by))),
+    ):
+        x, x_left = divmod(u * by - ay * v, determinant)
+        y, y_left = divmod(ax * v - bx * u, determinant)
+        # NOTE: Diagonals of different parities cross between points.
+        if not x_left and not y_left:
+            yield x, y
+
+
+def count_sweep(lines: list[Segment]) -> int:
+    """
+    >>> count_sweep([(0, 9, 5, 9), (0, 9, 2, 9), (1, 1, 3, 3), (3, 1, 1, 3)])
+    4
+    >>> count_sweep([(0, 0, 4, 0), (0, 0, 2, 0), (1, 0, 1, 3), (0, 1, 2, 1),
+    ...     (1, 1, 1, 5)])
+    6
+    """
+    spans: dict[str, dict[int, list[Span]]] = {family: {} for family in FAMILIES}
+    for line in lines:
+        family, key, span = _family(line)
+        spans[family].setdefault(key, []).append(span)
+
+    once: dict[str, dict[int, list[Span]]] = {family: {} for family in FAMILIES}
+    twice: dict[str, dict[int, list[Span]]] = {family: {} for family in FAMILIES}
+    for family, lines_of_family in spans.items():
+        for key, line_spans in lines_of_family.items():
+            once[family][key], covered = _cover(line_spans)
+            if covered:
+                twice[family][key] = covered
+
+    crossings = set()
+    for first, second in itertools.combinations(FAMILIES, 2):
+        crossings.update(_family_crossings(first, once[first], second, once[second]))
+
+    total = sum(hi - lo + 1 for f in twice.values() for c in f.values() for lo, hi in c)
+    for point in crossings:
+        stretches = 0
+        for family, lines_of_family in twice.items():
+            key, t = _along(family, point)
+            covered = lines_of_family.get(key, [])
+            index = bisect.bisect_right(covered, (t, t)) - 1
+            if index >= 0 and covered[index][1] >= t:
+                stretches += 1
+            elif index + 1 < len(covered) and covered[index + 1][0] == t:
+                stretches += 1
+
+        # NOTE: Counted once for each stretch it is on, and should be once.
+        total += 1 if stretches == 0 else 1 - stretches
+
+    return total
+
+
+def count_overlaps(lines: list[Segment]) -> int:
+    """Points covered by two or more of `lines`, counted densely when the
+    lines fit in a small enough box.
+
+    >>> count_overlaps([(0, 9, 5, 9), (0, 9, 2, 9), (10**12, 0, 10**12, 9)])
+    3
+    """
+    if not lines:
+        return 0
+
+    xs = [x for line in lines for x in line[0::2]]
+    ys = [y for line in lines for y in line[1::2]]
+    points = (max(xs) - min(xs) + 1) * (max(ys) - min(ys) + 1)
+    if numpy is not None and points <= DENSE_POINTS:
+        return count_dense(lines)
+    return count_sweep(lines)
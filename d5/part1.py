@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import Hashable, Iterable, Iterator, TypeVar, cast
+from typing import Hashable, Iterable, Iterator, TypeVar
 
-import parse
+from advent2021 import lineparse, loader
+from d5.overlap import count_overlaps, segments
 
-line_format = parse.compile("{x1:d},{y1:d} -> {x2:d},{y2:d}")
+line_format = lineparse.compile("{x1:d},{y1:d} -> {x2:d},{y2:d}")
 
 
 @dataclass(frozen=True)
@@ -12,10 +13,8 @@ class Coord:
     y: int
 
 
-def read() -> Iterator[str]:
-    with open("d5/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse_coords(lines: Iterable[str]) -> Iterator[tuple[Coord, Coord]]:
@@ -25,8 +24,8 @@ def parse_coords(lines: Iterable[str]) -> Iterator[tuple[Coord, Coord]]:
     [(Coord(x=795, y=887), Coord(x=541, y=887))]
     """
     for line in lines:
-        result = cast(parse.Result, line_format.parse(line))
-        yield Coord(result["x1"], result["y1"]), Coord(result["x2"], result["y2"])
+        x1, y1, x2, y2 = line_format.fields(line)
+        yield Coord(x1, y1), Coord(x2, y2)
 
 
 def generate_points(start: Coord, finish: Coord) -> Iterator[Coord]:
@@ -59,5 +58,5 @@ def duplicates(it: Iterable[T]) -> Iterator[T]:
 
 
 if __name__ == "__main__":
-    coords = get_coords(parse_coords(read()))
-    print(len(set(duplicates(coords))))
+    lines = parse_coords(read(loader.from_argv(__file__)))
+    print(count_overlaps(segments(lines, diagonals=False)))
@@ -0,0 +1,98 @@
+"""Lanternfish populations after any number of days by matrix powers.
+
+The population is a vector of how many fish have each timer value, and a day
+multiplies it by a fixed 9x9 matrix. Advancing `n` days multiplies it by the
+matrix to the power `n`, which is the product of the powers `2**k` for the
+bits `k` set in `n`. Those powers are squared up once and kept, so a query is
+a matrix-vector product per bit of `n`.
+
+The counts grow by about 9% a day, past a million digits after ten million
+days or so. Powers can be kept modulo some number instead, in which case
+there is no limit on the number of days.
+"""
+
+from __future__ import annotations
+
+from typing import Final, Iterable, TypeAlias
+
+AGES: Final[int] = 9
+NEW: Final[int] = 8
+RESET: Final[int] = 6
+
+Vector: TypeAlias = list[int]
+Matrix: TypeAlias = list[list[int]]
+
+
+def transition() -> Matrix:
+    """The matrix taking the counts of one day to those of the next."""
+    matrix = [[0] * AGES for _ in range(AGES)]
+    for age in range(1, AGES):
+        matrix[age - 1][age] = 1
+    matrix[RESET][0] = matrix[NEW][0] = 1
+    return matrix
+
+
+def counts(ages: Iterable[int]) -> Vector:
+    """
+    >>> counts([3, 4, 3, 1, 2])
+    [0, 1, 1, 2, 1, 0, 0, 0, 0]
+    """
+    vector = [0] * AGES
+    for age in ages:
+        vector[age] += 1
+    return vector
+
+
+class Population:
+    """Advances populations, keeping the powers of the matrix it squared.
+
+    >>> population = Population()
+    >>> population.total([3, 4, 3, 1, 2], 18), population.total([3, 4, 3, 1, 2], 256)
+    (26, 26984457539)
+    >>> Population(modulus=10**9).total([3, 4, 3, 1, 2], 10**100)
+    422193758
+    """
+
+    def __init__(self, modulus: int | None = None) -> None:
+        self.modulus = modulus
+        self.powers: list[Matrix] = [transition()]
+
+    def _reduce(self, value: int) -> int:
+        return value if self.modulus is None else value % self.modulus
+
+    def _power(self, bit: int) -> Matrix:
+        """The matrix to the power `2**bit`."""
+        while len(self.powers) <= bit:
+            last = self.powers[-1]
+            columns = list(zip(*last))
+            self.powers.append(
+                [
+                    [
+                        self._reduce(sum(a * b for a, b in zip(row, column)))
+                        for column in columns
+                    ]
+                    for row in last
+                ]
+            )
+        return self.powers[bit]
+
+    def advance(self, vector: Vector, days: int) -> Vector:
+        # NOTE: Powers of one matrix commute, so the bits can go in any order.
+        for bit in range(days.bit_length()):
+            if days >> bit & 1:
+                vector = [
+                    self._reduce(sum(a * b for a, b in zip(row, vector)))
+                    for row in self._power(bit)
+                ]
+        return vector
+
+    def total(self, ages: Iterable[int], days: int) -> int:
+        return self._reduce(sum(self.advance(counts(ages), days)))
+
+    def totals(self, queries: Iterable[tuple[Iterable[int], int]]) -> list[int]:
+        """The total for each `(ages, days)`, all sharing the same powers.
+
+        >>> Population().totals([([3, 4, 3, 1, 2], 80), ([0], 1), ([0], 8)])
+        [5934, 2, 3]
+        """
+        return [self.total(ages, days) for ages, days in queries]
@@ -0,0 +1,129 @@
+"""Cheapest alignment of crabs without trying every position.
+
+With a cost linear in the distance moved, the total is smallest at the
+median: moving past it takes a step further from more crabs than it brings
+closer. With the triangular cost `d * (d + 1) / 2` the total is, up to the
+`|d| / 2` term, a sum of squares, which is smallest at the mean, so the best
+position is within half a step of the mean.
+
+For other costs that are polynomials of the distance, `cost_curve` gives the
+total at every position at once. The positions are counted into a histogram
+and, for each power of the position, prefix sums of the histogram weighted by
+that power give the sums over the crabs left and right of any position in
+O(1), so the curve takes O(n + range) rather than O(n * range).
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+from dataclasses import dataclass
+from typing import Collection, Iterable
+
+
+@dataclass(frozen=True)
+class Cost:
+    """A cost of `sum(coefficients[k] * distance**k) // divisor`, where the
+    divisor divides the sum exactly for every distance.
+
+    >>> TRIANGULAR(4)
+    10
+    """
+
+    coefficients: tuple[int, ...]
+    divisor: int = 1
+
+    def __call__(self, distance: int) -> int:
+        return (
+            sum(c * distance**k for k, c in enumerate(self.coefficients))
+            // self.divisor
+        )
+
+
+LINEAR = Cost((0, 1))
+TRIANGULAR = Cost((0, 1, 1), divisor=2)
+
+
+def total(positions: Iterable[int], position: int, cost: Cost) -> int:
+    return sum(cost(abs(position - p)) for p in positions)
+
+
+def _cheapest(
+    positions: Collection[int], candidates: Iterable[int], cost: Cost
+) -> tuple[int, int]:
+    """The first of `candidates` with the lowest total and that total."""
+    # NOTE: Crabs often share positions, so cost each position once.
+    counts = collections.Counter(positions)
+    return min(
+        ((c, sum(n * cost(abs(c - p)) for p, n in counts.items())) for c in candidates),
+        key=lambda pair: pair[1],
+    )
+
+
+def best_linear(positions: Collection[int]) -> tuple[int, int]:
+    """
+    >>> best_linear([16, 1, 2, 0, 4, 2, 7, 1, 2, 14])
+    (2, 37)
+    """
+    ordered = sorted(positions)
+    # NOTE: Any position between the two middle ones is as good, take the first.
+    return _cheapest(positions, [ordered[(len(ordered) - 1) // 2]], LINEAR)
+
+
+def best_triangular(positions: Collection[int]) -> tuple[int, int]:
+    """
+    >>> best_triangular([16, 1, 2, 0, 4, 2, 7, 1, 2, 14])
+    (5, 168)
+    """
+    count, whole = len(positions), sum(positions)
+    # NOTE: Every integer from floor(mean - 1/2) up to ceil(mean + 1/2).
+    lowest = (2 * whole - count) // (2 * count)
+    highest = -(-(2 * whole + count) // (2 * count))
+    return _cheapest(positions, range(lowest, highest + 1), TRIANGULAR)
+
+
+def cost_curve(positions: Iterable[int], cost: Cost) -> tuple[int, list[int]]:
+    """The first position and the total cost at every position from there up
+    to the last crab.
+
+    >>> start, curve = cost_curve([16, 1, 2, 0, 4, 2, 7, 1, 2, 14], TRIANGULAR)
+    >>> start, curve[:6]
+    (0, [290, 242, 206, 183, 170, 168])
+    """
+    positions = list(positions)
+    start = min(positions)
+    size = max(positions) - start + 1
+    histogram = [0] * size
+    for position in positions:
+        histogram[position - start] += 1
+
+    degree = len(cost.coefficients)
+    # NOTE: moments[j][x] is the sum of p**j over the crabs at or left of x.
+    moments = []
+    for power in range(degree):
+        running, prefix = 0, []
+        for x, count in enumerate(histogram):
+            running += count * x**power
+            prefix.append(running)
+        moments.append(prefix)
+    totals = [m[-1] for m in moments]
+
+    curve = []
+    for x in range(size):
+        value = 0
+        for k, coefficient in enumerate(cost.coefficients):
+            if not coefficient:
+                continue
+            # NOTE: Expanding (x - p)**k and (p - x)**k binomially.
+            left = sum(
+                math.comb(k, j) * x ** (k - j) * (-1) ** j * moments[j][x]
+                for j in range(k + 1)
+            )
+            right = sum(
+                math.comb(k, j) * (-x) ** (k - j) * (totals[j] - moments[j][x])
+                for j in range(k + 1)
+            )
+            value += coefficient * (left + right)
+        curve.append(value // cost.divisor)
+
+    return start, curve
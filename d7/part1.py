@@ -1,9 +1,11 @@
 from typing import Collection, Iterable, Iterator
 
+from advent2021 import loader
+from d7.alignment import best_linear
 
-def read() -> Iterator[int]:
-    with open("d7/input.txt") as f:
-        return (int(s) for s in f.read().strip().split(','))
+
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[int]:
+    return (int(s) for s in loader.text(source).strip().split(","))
 
 
 def costs(starting: Iterable[int], position: int) -> Iterator[int]:
@@ -17,5 +19,5 @@ def check_positions(starting: Collection[int]) -> Iterator[tuple[int, int]]:
 
 
 if __name__ == "__main__":
-    starting = list(read())
-    print(min(check_positions(starting), key=lambda a: a[1]))
+    starting = list(read(loader.from_argv(__file__)))
+    print(best_linear(starting))
@@ -1,9 +1,11 @@
 from typing import Collection, Iterator
 
+from advent2021 import loader
+from d7.alignment import best_triangular
 
-def read() -> Iterator[int]:
-    with open("d7/input.txt") as f:
-        return (int(s) for s in f.read().strip().split(','))
+
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[int]:
+    return (int(s) for s in loader.text(source).strip().split(","))
 
 
 def fuel_cost(starting: int, end: int) -> int:
@@ -12,7 +14,7 @@ def fuel_cost(starting: int, end: int) -> int:
     6
     """
     distance = abs(starting - end)
-    cost =  distance * (distance + 1) / 2
+    cost = distance * (distance + 1) / 2
     assert cost == int(cost), "cost must always be exact"
     return int(cost)
 
@@ -23,4 +25,4 @@ def check_costs(positions: Collection[int]) -> Iterator[tuple[int, int]]:
 
 
 if __name__ == "__main__":
-    print(min(check_costs(list(read())), key=lambda a: a[1]))
+    print(best_triangular(list(read(loader.from_argv(__file__)))))
@@ -1,10 +1,10 @@
 from typing import Iterable, Iterator
 
+from advent2021 import loader
 
-def read() -> Iterator[str]:
-    with open("d8/input.txt") as f:
-        for line in f:
-            yield line.strip()
+
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def parse(lines: Iterable[str]) -> Iterator[tuple[list[str], list[str]]]:
@@ -24,4 +24,4 @@ def count_digits(lines: Iterable[str]) -> int:
 
 
 if __name__ == "__main__":
-    print(count_digits(read()))
+    print(count_digits(read(loader.from_argv(__file__))))
@@ -1,14 +1,30 @@
+import argparse
 import asyncio
-from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
-
-from d8 import constraint
+import concurrent.futures
+import functools
+import itertools
+import time
+from types import ModuleType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Final,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+
+from advent2021 import loader
+from d8 import constraint, propagate
 from d8.constraint import Value
 
+BATCH_SIZE: Final[int] = 1000
+CONCURRENCY: Final[int] = 8
+
 
-def read() -> Iterator[str]:
-    with open("d8/input.txt") as f:
-        for line in f:
-            yield line.strip()
+def read(source: loader.Source = loader.default(__file__)) -> Iterator[str]:
+    return loader.lines(source)
 
 
 def sort_string(string: str) -> str:
@@ -28,6 +44,43 @@ def parse(lines: Iterable[str]) -> Iterator[tuple[list[str], list[str]]]:
         )
 
 
+def declare(backend: ModuleType, values: Sequence[Any]) -> list[Any]:
+    """Declare the constraints between the digits to `backend`, either
+    `d8.constraint` or `d8.propagate`, returning what it returned for each."""
+    return [
+        backend.length(values[0], 6),
+        backend.length(values[1], 2),
+        backend.length(values[3], 5),
+        backend.length(values[4], 4),
+        backend.length(values[5], 5),
+        backend.length(values[6], 6),
+        backend.length(values[7], 3),
+        backend.length(values[8], 7),
+        backend.length(values[9], 6),
+        backend.unique(*values),
+        backend.subsets(values[0], values[8]),
+        backend.subsets(values[1], values[0]),
+        backend.subsets(values[1], values[3]),
+        backend.subsets(values[1], values[4]),
+        backend.subsets(values[1], values[7]),
+        backend.subsets(values[1], values[8]),
+        backend.subsets(values[1], values[9]),
+        backend.subsets(values[2], values[8]),
+        backend.subsets(values[3], values[8]),
+        backend.subsets(values[3], values[9]),
+        backend.subsets(values[4], values[8]),
+        backend.subsets(values[4], values[9]),
+        backend.subsets(values[5], values[8]),
+        backend.subsets(values[5], values[6]),
+        backend.subsets(values[6], values[8]),
+        backend.subsets(values[7], values[0]),
+        backend.subsets(values[7], values[3]),
+        backend.subsets(values[7], values[8]),
+        backend.subsets(values[7], values[9]),
+        backend.subsets(values[9], values[8]),
+    ]
+
+
 async def deduce(values: list[Value]) -> dict[str, int]:
     """Resolve all constraints using the event loop.
 
@@ -35,45 +88,101 @@ async def deduce(values: list[Value]) -> dict[str, int]:
     another value. Allowing the task to be done implicitly in a
     topological order.
     """
-    await asyncio.gather(
-        # NOTE: Declare constraints here.
-        constraint.length(values[0], 6),
-        constraint.length(values[1], 2),
-        constraint.length(values[3], 5),
-        constraint.length(values[4], 4),
-        constraint.length(values[5], 5),
-        constraint.length(values[6], 6),
-        constraint.length(values[7], 3),
-        constraint.length(values[8], 7),
-        constraint.length(values[9], 6),
-        constraint.unique(*values),
-        constraint.subsets(values[0], values[8]),
-        constraint.subsets(values[1], values[0]),
-        constraint.subsets(values[1], values[3]),
-        constraint.subsets(values[1], values[4]),
-        constraint.subsets(values[1], values[7]),
-        constraint.subsets(values[1], values[8]),
-        constraint.subsets(values[1], values[9]),
-        constraint.subsets(values[2], values[8]),
-        constraint.subsets(values[3], values[8]),
-        constraint.subsets(values[3], values[9]),
-        constraint.subsets(values[4], values[8]),
-        constraint.subsets(values[4], values[9]),
-        constraint.subsets(values[5], values[8]),
-        constraint.subsets(values[5], values[6]),
-        constraint.subsets(values[6], values[8]),
-        constraint.subsets(values[7], values[0]),
-        constraint.subsets(values[7], values[3]),
-        constraint.subsets(values[7], values[8]),
-        constraint.subsets(values[7], values[9]),
-        constraint.subsets(values[9], values[8]),
-    )
+    await asyncio.gather(*declare(constraint, values))
     return {await value: value.index for value in values}
 
 
+def network() -> propagate.Network:
+    """The same constraints declared once on a network solving any display."""
+    network = propagate.Network(10)
+    declare(propagate, network.variables)
+    return network
+
+
+async def solve(patterns: list[str], outputs: list[str]) -> int:
+    mapping = await deduce([Value(i, set(patterns)) for i in range(10)])
+    return int("".join(str(mapping[output]) for output in outputs))
+
+
 async def decode(lines: Iterable[str]) -> AsyncIterator[int]:
     for patterns, outputs in parse(lines):
-        mapping = await deduce([Value(i, set(patterns)) for i in range(10)])
+        yield await solve(patterns, outputs)
+
+
+def batches(lines: Iterable[str], size: int = BATCH_SIZE) -> Iterator[list[str]]:
+    lines = iter(lines)
+    while batch := list(itertools.islice(lines, size)):
+        yield batch
+
+
+async def decode_batch(
+    lines: Iterable[str], concurrency: int = CONCURRENCY
+) -> list[int]:
+    """Decode displays side by side on one loop, `concurrency` at a time.
+
+    >>> asyncio.run(decode_batch(["acedgfb cdfbe gcdfa fbcad dab cefabd cdfgeb"
+    ...     " eafb cagedb ab | cdfeb fcadb cdfeb cdbaf"] * 3, concurrency=2))
+    [5353, 5353, 5353]
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(patterns: list[str], outputs: list[str]) -> int:
+        async with semaphore:
+            return await solve(patterns, outputs)
+
+    return await asyncio.gather(*(bounded(p, o) for p, o in parse(lines)))
+
+
+async def total_concurrent(
+    lines: Iterable[str], concurrency: int = CONCURRENCY, size: int = BATCH_SIZE
+) -> int:
+    """The sum of the displays, decoded a batch of `size` lines at a time."""
+    total = 0
+    for batch in batches(lines, size):
+        total += sum(await decode_batch(batch, concurrency))
+    return total
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _start_loop() -> None:
+    global _loop
+    _loop = asyncio.new_event_loop()
+
+
+def _total_batch(batch: list[str], concurrency: int) -> int:
+    """Decode a batch on the event loop of this worker process."""
+    assert _loop is not None
+    return sum(_loop.run_until_complete(decode_batch(batch, concurrency)))
+
+
+def total_parallel(
+    lines: Iterable[str],
+    jobs: int,
+    concurrency: int = CONCURRENCY,
+    size: int = BATCH_SIZE,
+) -> int:
+    """The sum of the displays, with batches fanned out to `jobs` processes
+    that each keep one event loop for every batch they are given."""
+    with concurrent.futures.ProcessPoolExecutor(jobs, initializer=_start_loop) as pool:
+        return sum(
+            pool.map(
+                functools.partial(_total_batch, concurrency=concurrency),
+                batches(lines, size),
+            )
+        )
+
+
+def decode_sync(lines: Iterable[str]) -> Iterator[int]:
+    """
+    >>> next(decode_sync(["acedgfb cdfbe gcdfa fbcad dab cefabd cdfgeb eafb"
+    ...     " cagedb ab | cdfeb fcadb cdfeb cdbaf"]))
+    5353
+    """
+    solver = network()
+    for patterns, outputs in parse(lines):
+        mapping = solver.solve(patterns)
         yield int("".join(str(mapping[output]) for output in outputs))
 
 
@@ -84,9 +193,28 @@ async def asum(ai: AsyncIterable[int]) -> int:
     return total
 
 
-async def main() -> None:
-    print(await asum(decode(read())))
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m d8.part2csp")
+    parser.add_argument("source", nargs="?", default=loader.default(__file__))
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    lines = list(read(args.source))
+    start = time.perf_counter()
+    if args.jobs == 1:
+        total = asyncio.run(total_concurrent(lines, args.concurrency, args.batch_size))
+    else:
+        total = total_parallel(lines, args.jobs, args.concurrency, args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    print(total)
+    print(
+        f"decoded {len(lines)} lines in {elapsed:.3f}s"
+        f" ({len(lines) / elapsed:,.0f} lines/s)"
+    )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
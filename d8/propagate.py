@@ -0,0 +1,242 @@
+"""Solve the declarations of `d8.constraint` without an event loop.
+
+The same `length`, `subsets` and `unique` are declared here on the variables
+of a `Network`, once, and the network then solves the patterns of any number
+of displays. A variable's domain is a bitset of the patterns it could still
+be, and solving is a worklist of constraints: a constraint whose variables
+lost options is run again to remove the options of the others that no longer
+have a support, until nothing changes.
+
+Which patterns support which is a property of the display, so a constraint
+only names a relation and each display works the relations out once, as
+bitsets, from the masks of its patterns.
+
+    $ python -m d8.propagate displays.txt --lines 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Final, Sequence
+
+from advent2021 import loader
+from d8.signature import mask
+
+SUPERSETS: Final[str] = "supersets"
+SUBSETS: Final[str] = "subsets"
+
+
+@dataclass(frozen=True, eq=False)
+class Variable:
+    index: int
+    network: Network = field(repr=False)
+
+
+@dataclass(frozen=True)
+class Length:
+    variable: int
+    n: int
+
+    @property
+    def variables(self) -> tuple[int, ...]:
+        return (self.variable,)
+
+    def propagate(self, domains: list[int], display: Display) -> list[int]:
+        return display.restrict(domains, self.variable, display.lengths[self.n])
+
+
+@dataclass(frozen=True)
+class Subset:
+    sub: int
+    sup: int
+
+    @property
+    def variables(self) -> tuple[int, ...]:
+        return self.sub, self.sup
+
+    def propagate(self, domains: list[int], display: Display) -> list[int]:
+        # NOTE: A sub needs a superset left in the sup's domain, and the other
+        # way around.
+        return display.restrict(
+            domains, self.sub, display.related(SUBSETS, domains[self.sup])
+        ) + display.restrict(
+            domains, self.sup, display.related(SUPERSETS, domains[self.sub])
+        )
+
+
+@dataclass(frozen=True)
+class Unique:
+    group: tuple[int, ...]
+
+    @property
+    def variables(self) -> tuple[int, ...]:
+        return self.group
+
+    def propagate(self, domains: list[int], display: Display) -> list[int]:
+        # NOTE: Only a variable down to one option takes it from the others,
+        # which is all that pairwise `!=` constraints could do.
+        changed: list[int] = []
+        while True:
+            taken = 0
+            for variable in self.group:
+                domain = domains[variable]
+                if not domain & (domain - 1):
+                    if domain & taken:
+                        raise ValueError("two variables left with one pattern")
+                    taken |= domain
+
+            removed = []
+            for variable in self.group:
+                domain = domains[variable]
+                if domain & (domain - 1) and domain & taken:
+                    removed += display.restrict(domains, variable, ~taken)
+            if not removed:
+                return changed
+            # NOTE: Options taken may leave another variable down to one.
+            changed += removed
+
+
+Constraint = Length | Subset | Unique
+
+
+class Display:
+    """The relations between the patterns of one display, as bitsets."""
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        masks = [mask(pattern) for pattern in self.patterns]
+        self.lengths = collections.defaultdict(int)
+        for i, pattern in enumerate(self.patterns):
+            self.lengths[len(pattern)] |= 1 << i
+
+        # NOTE: For each pattern, the bitset of its supersets and of its
+        # subsets, itself included.
+        self.relations = {
+            SUPERSETS: [
+                sum(1 << j for j, sup in enumerate(masks) if sub & ~sup == 0)
+                for sub in masks
+            ],
+            SUBSETS: [
+                sum(1 << j for j, sub in enumerate(masks) if sub & ~sup == 0)
+                for sup in masks
+            ],
+        }
+
+    def related(self, relation: str, domain: int) -> int:
+        """The options in `relation` to some option of `domain`, say the
+        subsets of any of them."""
+        table = self.relations[relation]
+        options = 0
+        while domain:
+            lowest = domain & -domain
+            options |= table[lowest.bit_length() - 1]
+            domain ^= lowest
+        return options
+
+    def restrict(self, domains: list[int], variable: int, options: int) -> list[int]:
+        """Keep only `options` for `variable`, the variable if that changed."""
+        domain = domains[variable]
+        if domain & options == domain:
+            return []
+        if not domain & options:
+            raise ValueError(f"no pattern left for variable {variable}")
+        domains[variable] = domain & options
+        return [variable]
+
+
+class Network:
+    """Variables and the constraints declared between them.
+
+    >>> network = Network(2)
+    >>> first, second = network.variables
+    >>> length(first, 2); subsets(first, second); unique(first, second)
+    >>> network.solve(["ab", "abc", "bcd"])
+    {'ab': 0, 'abc': 1}
+    """
+
+    def __init__(self, size: int) -> None:
+        self.variables = [Variable(i, self) for i in range(size)]
+        self.constraints: list[Constraint] = []
+        self.watching: list[list[int]] = [[] for _ in range(size)]
+
+    def declare(self, constraint: Constraint) -> None:
+        for variable in constraint.variables:
+            self.watching[variable].append(len(self.constraints))
+        self.constraints.append(constraint)
+
+    def solve(self, patterns: Sequence[str]) -> dict[str, int]:
+        """The pattern of every variable, keyed by pattern like
+        `d8.part2csp.deduce`."""
+        display = Display(patterns)
+        domains = [(1 << len(patterns)) - 1] * len(self.variables)
+
+        pending = collections.deque(range(len(self.constraints)))
+        queued = [True] * len(self.constraints)
+        while pending:
+            current = pending.popleft()
+            queued[current] = False
+            for variable in self.constraints[current].propagate(domains, display):
+                for other in self.watching[variable]:
+                    if not queued[other] and other != current:
+                        queued[other] = True
+                        pending.append(other)
+
+        if any(domain & (domain - 1) for domain in domains):
+            raise ValueError("the constraints leave more than one pattern")
+        return {
+            display.patterns[domain.bit_length() - 1]: variable
+            for variable, domain in enumerate(domains)
+        }
+
+
+def length(value: Variable, n: int) -> None:
+    """Declare that the `value` is of length `n`."""
+    value.network.declare(Length(value.index, n))
+
+
+def subsets(sub: Variable, sup: Variable) -> None:
+    """Declare that `sub` ⊆ `sup`."""
+    sub.network.declare(Subset(sub.index, sup.index))
+
+
+def unique(*values: Variable) -> None:
+    """Declare that values are unique."""
+    values[0].network.declare(Unique(tuple(value.index for value in values)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    from d8 import part2csp
+
+    parser = argparse.ArgumentParser(prog="python -m d8.propagate")
+    parser.add_argument("source", nargs="?", default=loader.default(__file__))
+    parser.add_argument("--lines", type=int, default=None)
+    parser.add_argument(
+        "--asyncio-lines",
+        type=int,
+        default=1000,
+        help="lines to time the asyncio backend on, it is much slower",
+    )
+    args = parser.parse_args(argv)
+
+    lines = list(itertools.islice(loader.lines(args.source), args.lines))
+    for backend, count in (("sync", len(lines)), ("asyncio", args.asyncio_lines)):
+        sample = lines[:count]
+        start = time.perf_counter()
+        if backend == "sync":
+            result = sum(part2csp.decode_sync(sample))
+        else:
+            result = asyncio.run(part2csp.asum(part2csp.decode(sample)))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{backend}: {result} from {len(sample)} lines in {elapsed:.3f}s"
+            f" ({len(sample) / elapsed:,.0f} lines/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Decode displays with bitmasks and a signature per digit, no deduction.
+
+With the patterns as 7-bit masks, count how many of the ten patterns light
+each wire. A digit's signature is the sum of those counts over its wires, and
+as the ten patterns always light every wire as often whatever the wiring, the
+signatures of the digits are the same for every display, and all different:
+
+    0: 42, 1: 17, 2: 34, 3: 39, 4: 30, 5: 37, 6: 41, 7: 25, 8: 49, 9: 45
+
+So an output is decoded by looking its signature up in a fixed table. With
+numpy a whole chunk of a file is parsed and looked up at once:
+
+    $ python -m d8.signature displays.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import time
+from typing import Final, Iterable, Iterator
+
+from advent2021 import loader
+from advent2021.optional import numpy
+
+WIRES: Final[str] = "abcdefg"
+DIGITS: Final[tuple[str, ...]] = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+# NOTE: Ten patterns, the separating `|` and four outputs.
+TOKENS: Final[int] = 15
+PLACES: Final[tuple[int, ...]] = (1000, 100, 10, 1)
+CHUNK_SIZE: Final[int] = 1 << 22
+
+
+def mask(pattern: str) -> int:
+    """
+    >>> bin(mask("cfa"))
+    '0b100101'
+    """
+    return sum(1 << WIRES.index(wire) for wire in pattern)
+
+
+def signature(output: int, patterns: Iterable[int]) -> int:
+    """The sum over the wires of `output` of how many `patterns` light them."""
+    return sum((output & pattern).bit_count() for pattern in patterns)
+
+
+_CANONICAL = [mask(digit) for digit in DIGITS]
+SIGNATURES: Final[dict[int, int]] = {
+    signature(m, _CANONICAL): digit for digit, m in enumerate(_CANONICAL)
+}
+
+
+if numpy is not None:
+    _LOOKUP = numpy.full(max(SIGNATURES) + 1, -1, numpy.int64)
+    for _signature, _digit in SIGNATURES.items():
+        _LOOKUP[_signature] = _digit
+    _POPCOUNT = numpy.array([n.bit_count() for n in range(256)], numpy.uint8)
+
+
+def decode_line(line: str) -> int:
+    """
+    >>> decode_line("acedgfb cdfbe gcdfa fbcad dab cefabd cdfgeb eafb cagedb ab"
+    ...     " | cdfeb fcadb cdfeb cdbaf")
+    5353
+    """
+    patterns, outputs = line.split(" | ")
+    # NOTE: Counting the wires of the patterns straight from the text is the
+    # same as summing `signature` over masks, without building them.
+    lit = collections.Counter(patterns)
+    value = 0
+    for output in outputs.split():
+        value = value * 10 + SIGNATURES[sum(lit[wire] for wire in output)]
+    return value
+
+
+def decode(lines: Iterable[str]) -> Iterator[int]:
+    return map(decode_line, lines)
+
+
+def decode_text(text: bytes) -> numpy.ndarray:
+    """The value of every display in `text`, whole lines ending in newlines.
+
+    >>> decode_text(b"be cfbegad cbdgef fgaecd cgeb fdcge agebfd fecdb fabcd edb"
+    ...     b" | fdgacbe cefdb cefbgd gcbe\\n"
+    ...     b"edbfga begcd cbg gc gcadebf fbgde acbgfd abcde gfcbed gfec"
+    ...     b" | fcgedb cgb dgebacf gc\\n")
+    array([8394, 9781])
+    """
+    letters = numpy.frombuffer(text, numpy.uint8)
+    # NOTE: Spaces and newlines are the only bytes at or below a space.
+    ends = numpy.flatnonzero(letters <= ord(" "))
+    # NOTE: Bytes other than wires shift the bit out to 0. Each token's mask
+    # is then the sum of its bits, the difference of prefix sums at its ends,
+    # and as masks are below 256 the sums can wrap around in bytes.
+    bits = numpy.left_shift(numpy.uint8(1), letters - numpy.uint8(ord("a")))
+    prefix = numpy.cumsum(bits, dtype=numpy.uint8)[ends]
+    masks = numpy.diff(prefix, prepend=numpy.uint8(0)).reshape(-1, TOKENS)
+
+    patterns, outputs = masks[:, :10], masks[:, 11:]
+    signatures = numpy.zeros(outputs.shape, numpy.uint8)
+    for pattern in patterns.T:
+        signatures += _POPCOUNT[pattern[:, None] & outputs]
+    return _LOOKUP[signatures] @ numpy.array(PLACES)
+
+
+def total(source: loader.Source) -> int:
+    if numpy is None:
+        return sum(decode(loader.lines(source)))
+    return sum(
+        int(decode_text(chunk).sum())
+        for chunk in loader.line_chunks(source, CHUNK_SIZE)
+    )
+
+
+def total_lines(lines: Iterable[str]) -> int:
+    """
+    >>> total_lines(["acedgfb cdfbe gcdfa fbcad dab cefabd cdfgeb eafb cagedb ab"
+    ...     " | cdfeb fcadb cdfeb cdbaf"])
+    5353
+    """
+    if numpy is None:
+        return sum(decode(lines))
+    text = "".join(line + "\n" for line in lines).encode()
+    return int(decode_text(text).sum()) if text else 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m d8.signature")
+    parser.add_argument("source", nargs="?", default=loader.default(__file__))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if numpy is None:
+        values = list(decode(loader.lines(args.source)))
+        result, count = sum(values), len(values)
+    else:
+        result = count = 0
+        for chunk in loader.line_chunks(args.source, CHUNK_SIZE):
+            values = decode_text(chunk)
+            result += int(values.sum())
+            count += len(values)
+    elapsed = time.perf_counter() - start
+
+    print(result)
+    print(f"decoded {count} lines in {elapsed:.3f}s ({count / elapsed:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
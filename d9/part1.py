@@ -1,37 +1,30 @@
 from typing import Iterator
 
+from advent2021 import loader
+from advent2021.grid import Grid
+from advent2021.optional import numpy
 
-def read() -> list[list[int]]:
-    with open("d9/input.txt") as f:
-        return [[int(c) for c in l.strip()] for l in f]
 
+def read(source: loader.Source = loader.default(__file__)) -> Grid:
+    return Grid.read(source)
 
-def _adjacent_coord(row: int, col: int) -> Iterator[tuple[int, int]]:
-    yield row - 1, col
-    yield row + 1, col
-    yield row, col - 1
-    yield row, col + 1
 
+def get_low_points(grid: Grid) -> Iterator[int]:
+    """
+    >>> sorted(get_low_points(Grid.parse("219\\n398\\n985")))
+    [1, 5]
+    """
+    if numpy is not None:
+        heights = grid.array
+        lowest = grid.neighbours(fill=10).min(axis=0)
+        yield from heights[heights < lowest].tolist()
+        return
 
-def _in_bound(rows: int, cols: int, row: int, col: int) -> bool:
-    return 0 <= row < rows and 0 <= col < cols
-
-
-def adjacent(grid: list[list[int]], row: int, col: int) -> Iterator[int]:
-    rows = len(grid)
-    cols = len(grid[0])
-    for row, col in _adjacent_coord(row, col):
-        if _in_bound(rows, cols, row, col):
-            yield grid[row][col]
-
-
-def get_low_points(grid: list[list[int]]) -> Iterator[int]:
-    for r, row in enumerate(grid):
-        for c, value in enumerate(row):
-            if all(value < v for v in adjacent(grid, r, c)):
-                yield value
+    for coord, value in grid.items():
+        if all(value < grid[c] for c in grid.adjacent(coord)):
+            yield value
 
 
 if __name__ == "__main__":
-    grid = read()
+    grid = read(loader.from_argv(__file__))
     print(sum(height + 1 for height in get_low_points(grid)))
@@ -1,90 +1,88 @@
-from dataclasses import dataclass
-from functools import cached_property
-from typing import Iterable, Iterator, TypeAlias
+"""Basins are labelled all at once as connected regions of cells below 9.
 
-Coord: TypeAlias = tuple[int, int]
+Every cell that isn't a 9 flows to exactly one low point, so each region of
+such cells bounded by 9s is one basin.
+"""
 
+from __future__ import annotations
 
-def read() -> list[list[int]]:
-    with open("d9/input.txt") as f:
-        return [[int(c) for c in l.strip()] for l in f]
+from collections import Counter
+from typing import Iterable
 
+from advent2021 import loader
+from advent2021.grid import Coord, Grid
+from advent2021.optional import numpy
 
-@dataclass
-class Grid:
-    grid: list[list[int]]
 
-    def __getitem__(self, coord: Coord) -> int:
-        return self.grid[coord[0]][coord[1]]
+def read(source: loader.Source = loader.default(__file__)) -> Grid:
+    return Grid.read(source)
 
-    @cached_property
-    def height(self):
-        return len(self.grid)
 
-    @cached_property
-    def width(self):
-        return len(self.grid[0])
+def _find(parents: dict[Coord, Coord], coord: Coord) -> Coord:
+    while parents[coord] != coord:
+        parents[coord] = coord = parents[parents[coord]]
+    return coord
 
-    def adjacent(self, coord: Coord) -> Iterator[tuple[Coord, int]]:
-        for neighbour in _adjacent_coord(coord):
-            if _in_bound(self.height, self.width, neighbour):
-                yield (neighbour), self[neighbour]
 
-    def values(self) -> Iterator[tuple[Coord, int]]:
-        for r, row in enumerate(self.grid):
-            for c, value in enumerate(row):
-                yield (r, c), value
+def _basin_sizes_cells(grid: Grid) -> list[int]:
+    """Scanline union-find, joining each cell to the cells above and left."""
+    parents: dict[Coord, Coord] = {}
+    for (row, col), value in grid.items():
+        if value == 9:
+            continue
 
-    def low_points(self) -> Iterator[tuple[Coord, int]]:
-        for coord, value in self.values():
-            if all(value < v for _, v in self.adjacent(coord)):
-                yield coord, value
+        parents[row, col] = (row, col)
+        for neighbour in ((row - 1, col), (row, col - 1)):
+            if neighbour in parents:
+                parents[_find(parents, neighbour)] = _find(parents, (row, col))
 
-    def basin(self, start: Coord) -> Iterator[tuple[Coord, int]]:
-        """Get basin flowing towards `start`."""
-        queue = [(start, self[start])]
-        visited = set()
-        while queue:
-            point, height = queue.pop(0)
-            if point in visited:
-                continue
-            yield point, height
-            visited.add(point)
-            queue.extend((c, v) for c, v in self.adjacent(point) if height < v < 9)
+    return list(Counter(_find(parents, c) for c in parents).values())
 
 
-def _adjacent_coord(coord: Coord) -> Iterator[Coord]:
-    """
-    >>> set(_adjacent_coord((1, 1))) == {(0, 1), (1, 0), (2, 1), (1, 2)}
-    True
-    """
-    row, col = coord
-    yield row - 1, col
-    yield row + 1, col
-    yield row, col - 1
-    yield row, col + 1
+def _join(labels: numpy.ndarray, a: numpy.ndarray, b: numpy.ndarray) -> None:
+    """Merge the labels of every pair `a`, `b` in place, lowest label wins."""
+    while True:
+        roots_a, roots_b = labels[a], labels[b]
+        lowest = numpy.minimum(roots_a, roots_b)
+        joined = labels.copy()
+        numpy.minimum.at(joined, roots_a, lowest)
+        numpy.minimum.at(joined, roots_b, lowest)
+        # NOTE: Point every label straight at its root before the next round.
+        while not numpy.array_equal(jumped := joined[joined], joined):
+            joined = jumped
 
+        if numpy.array_equal(joined, labels):
+            return
+        labels[:] = joined
 
-def _in_bound(height: int, width: int, coord: Coord) -> bool:
-    """
-    >>> _in_bound(5, 5, (1, 1))
-    True
-    >>> _in_bound(5, 5, (-1, 0))
-    False
-    >>> _in_bound(5, 5, (5, 0))
-    False
-    """
-    row, col = coord
-    return 0 <= row < height and 0 <= col < width
 
+def _basin_sizes_array(grid: Grid) -> list[int]:
+    """Label horizontal runs of basin cells, then join runs touching vertically."""
+    inside = grid.array < 9
+    starts = inside.copy()
+    starts[:, 1:] &= ~inside[:, :-1]
+    dtype = numpy.int32 if inside.size < 2**31 else numpy.int64
+    runs = numpy.cumsum(starts.ravel(), dtype=dtype).reshape(inside.shape) - 1
 
-def ilen(it: Iterable) -> int:
-    return sum(1 for _ in it)
+    labels = numpy.arange(runs.flat[-1] + 1, dtype=dtype)
+    touching = inside[1:] & inside[:-1]
+    _join(labels, runs[1:][touching], runs[:-1][touching])
 
+    sizes = numpy.bincount(labels[runs[inside]])
+    return sizes[sizes > 0].tolist()
 
-def get_basin_sizes(grid: Grid) -> Iterator[int]:
-    for low_point, _ in grid.low_points():
-        yield ilen(grid.basin(low_point))
+
+def get_basin_sizes(grid: Grid) -> list[int]:
+    """
+    >>> sorted(get_basin_sizes(Grid.parse("219\\n398\\n985")))
+    [3, 3]
+    >>> rows = ["2199943210", "3987894921", "9856789892", "8767896789", "9899965678"]
+    >>> sorted(get_basin_sizes(Grid.parse("\\n".join(rows))))
+    [3, 9, 9, 14]
+    """
+    if numpy is not None:
+        return _basin_sizes_array(grid)
+    return _basin_sizes_cells(grid)
 
 
 def product(values: Iterable[int]) -> int:
@@ -96,5 +94,5 @@ def product(values: Iterable[int]) -> int:
 
 
 if __name__ == "__main__":
-    grid = Grid(read())
+    grid = read(loader.from_argv(__file__))
     print(product(sorted(get_basin_sizes(grid))[-3:]))